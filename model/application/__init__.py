@@ -4,8 +4,10 @@ from .config import (
     COLLECTION_NAME,
     OUTPUT_DIR,
     AUDIT_CRITERIA,
+    CriterionSpec,
     POSSIBLE_ANSWERS_ENABLED,
     llm,
+    llm_json,
     ef_sparse,
     ef_dense,
     update_config
@@ -18,9 +20,19 @@ from .possible_answer_models import (
     PossibleAnswerConfig
 )
 from .auditor import run_audit
-from .retriever import search_relevant_context, generate_query_embeddings
-from .enhanced_retriever import search_with_possible_answer
-from .evaluator import evaluate_criterion, evaluate_criterion_enhanced
+from .retriever import (
+    search_relevant_context,
+    search_relevant_context_batch,
+    search_relevant_chunks,
+    generate_query_embeddings
+)
+from .enhanced_retriever import search_with_possible_answer, search_chunks_with_possible_answer
+from .evaluator import (
+    evaluate_criterion,
+    evaluate_criterion_enhanced,
+    aevaluate_criterion,
+    aevaluate_criterion_enhanced
+)
 from .deep_agent import DeepResearchAgent, SearchState
 from .metrics import AuditMetrics, MetricsTracker
 from .output import (
@@ -40,8 +52,10 @@ __all__ = [
     "COLLECTION_NAME",
     "OUTPUT_DIR",
     "AUDIT_CRITERIA",
+    "CriterionSpec",
     "POSSIBLE_ANSWERS_ENABLED",
     "llm",
+    "llm_json",
     "ef_sparse",
     "ef_dense",
     "update_config",
@@ -55,10 +69,15 @@ __all__ = [
     # Core functions
     "run_audit",
     "search_relevant_context",
+    "search_relevant_context_batch",
+    "search_relevant_chunks",
     "generate_query_embeddings",
     "search_with_possible_answer",
+    "search_chunks_with_possible_answer",
     "evaluate_criterion",
     "evaluate_criterion_enhanced",
+    "aevaluate_criterion",
+    "aevaluate_criterion_enhanced",
     # Agents & Classes
     "DeepResearchAgent",
     "SearchState",
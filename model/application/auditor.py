@@ -2,17 +2,27 @@
 # ============================================================================
 
 import asyncio
-from pathlib import Path
+import functools
+import os
 from rich.console import Console
 
-from .config import AUDIT_CRITERIA, POSSIBLE_ANSWERS_ENABLED
-from .models import AuditReport
-from .deep_agent import DeepResearchAgent
+from .config import AUDIT_CRITERIA, POSSIBLE_ANSWERS_ENABLED, CriterionSpec, normalize_criteria
+from .models import AuditReport, CriterionResult
+from .deep_agent import DeepResearchAgent, SearchState
+from .enhanced_retriever import search_with_possible_answer
+from .evaluator import aevaluate_criterion, aevaluate_criterion_enhanced
 from .metrics import MetricsTracker
+from .possible_answer_generator import PossibleAnswerGenerator
 from .possible_answer_models import PossibleAnswer
+from .raw_extractor import RawPDFExtractor, PDFExtractionError
+from .retriever import search_relevant_context, search_relevant_context_batch
+from .progress_log import log, buffered_console
 
 console = Console()
 
+# Maximum number of criteria searched at the same time
+AUDIT_CONCURRENCY = int(os.environ.get("AUDIT_CONCURRENCY", "8"))
+
 
 async def run_audit(
     document_name: str,
@@ -41,7 +51,7 @@ async def run_audit(
         AuditReport with all results
     """
     # Use provided criteria or fall back to config
-    criteria = audit_criteria or AUDIT_CRITERIA
+    criteria = normalize_criteria(audit_criteria) if audit_criteria else AUDIT_CRITERIA
     
     # Determine if possible answers feature is enabled
     enable_possible_answers = (
@@ -52,6 +62,15 @@ async def run_audit(
     tracker = MetricsTracker()
     tracker.start_audit()
     
+    agent = DeepResearchAgent(
+        filename=document_name,
+        doc_type=doc_type,
+        collection_name=collection_name
+    )
+    
+    # Load the document size while possible answers are generated
+    ready_task = asyncio.create_task(agent.ensure_ready()) if use_deep_agent else None
+    
     # Generate possible answers if feature is enabled
     possible_answers_cache: dict[str, PossibleAnswer] = {}
     
@@ -61,91 +80,109 @@ async def run_audit(
             pdf_path=pdf_path,
             document_name=document_name
         )
+        await agent.set_possible_answers(possible_answers_cache)
     
-    agent = DeepResearchAgent(
-        filename=document_name,
-        doc_type=doc_type,
-        collection_name=collection_name,
-        possible_answers=possible_answers_cache if enable_possible_answers else None
-    )
+    if ready_task is not None:
+        await ready_task
     
-    with console.status("[bold green]Running audit...") as status:
-        
-        if use_deep_agent:
-            tasks = []
-            for i, criterion_config in enumerate(criteria, 1):
-                if isinstance(criterion_config, dict):
-                    criterion = criterion_config["query"]
-                    confidence = criterion_config.get("confidence", 0.7)
-                else:
-                    criterion = criterion_config
-                    confidence = 0.7
-                console.print(f"\n[cyan]Criterion {i}:[/cyan] {criterion[:50]}...")
-                tracker.start_criterion()
-                tasks.append(agent.search(criterion, min_confidence=confidence))
-            
-            status.update(f"[bold green]Evaluating {len(criteria)} criteria in parallel...")
-            results = await asyncio.gather(*tasks)
-        else:
-            from .retriever import search_relevant_context
-            from .evaluator import evaluate_criterion, evaluate_criterion_enhanced
-            from .enhanced_retriever import search_with_possible_answer
+    # (query, min_confidence, possible_answer) per criterion
+    parsed = [
+        (c.query, c.confidence, possible_answers_cache.get(c.query))
+        for c in criteria
+    ]
+    
+    # Criteria the full-document analysis did not find are reported as absent
+    # without spending retrieval and evaluation calls on them (a failed
+    # analysis is not a not-found: those criteria are searched normally)
+    results: list[CriterionResult | None] = [
+        _absent_from_possible_answer(possible_answer)
+        if possible_answer is not None and not possible_answer.found and not possible_answer.error
+        else None
+        for _, _, possible_answer in parsed
+    ]
+    to_search = [i for i, result in enumerate(results) if result is None]
+    
+    if len(to_search) < len(parsed):
+        log(f"[dim]Skipping {len(parsed) - len(to_search)} criteria not found by possible answers[/dim]")
+        tracker.start_criterion()
+        for result in results:
+            if result is not None:
+                tracker.finish_criterion(
+                    criterion=result.criterion,
+                    attempts=0,
+                    confidence=result.confidence
+                )
+    
+    async with buffered_console():
+        with console.status("[bold green]Running audit...") as status:
             
-            results = []
-            for i, criterion_config in enumerate(criteria, 1):
-                if isinstance(criterion_config, dict):
-                    criterion = criterion_config["query"]
-                else:
-                    criterion = criterion_config
-                status.update(f"[bold green]Evaluating criterion {i}/{len(criteria)}...")
-                console.print(f"\n[cyan]Criterion {i}:[/cyan] {criterion[:50]}...")
+            if use_deep_agent:
+                states = []
+                for i in to_search:
+                    criterion, confidence, _ = parsed[i]
+                    log(f"\n[cyan]Criterion {i + 1}:[/cyan] {criterion[:50]}...")
+                    states.append(agent.start_search(criterion, min_confidence=confidence))
                 
                 tracker.start_criterion()
+                status.update(f"[bold green]Evaluating {len(states)} criteria in parallel...")
+                await agent.prefetch_initial_contexts(states)
+                searched = await _run_deep_search(agent, states, tracker)
                 
-                # Get possible answer for this criterion if available
-                possible_answer = possible_answers_cache.get(criterion)
-                
-                if enable_possible_answers and possible_answer:
-                    # Use enhanced retriever with possible answer
-                    context, pages = await search_with_possible_answer(
-                        criterion=criterion,
-                        possible_answer=possible_answer,
+                for i, result in zip(to_search, searched):
+                    results[i] = result
+            else:
+                # Fetch the context of every criterion without a possible answer at once
+                plain = [parsed[i][0] for i in to_search if not parsed[i][2]]
+                if plain:
+                    await search_relevant_context_batch(
+                        criteria=plain,
                         filename=document_name,
                         doc_type=doc_type
                     )
-                    # Use enhanced evaluator
-                    result = evaluate_criterion_enhanced(criterion, context, pages, possible_answer)
-                else:
-                    # Fall back to standard retrieval and evaluation
-                    context, pages = await search_relevant_context(
+                
+                sem = asyncio.Semaphore(AUDIT_CONCURRENCY)
+                
+                async def _evaluate_one(i: int) -> None:
+                    criterion, _, possible_answer = parsed[i]
+                    
+                    async with sem:
+                        log(f"\n[cyan]Criterion {i + 1}:[/cyan] {criterion[:50]}...")
+                        
+                        if possible_answer:
+                            # Use enhanced retriever with possible answer
+                            context, pages = await search_with_possible_answer(
+                                criterion=criterion,
+                                possible_answer=possible_answer,
+                                filename=document_name,
+                                doc_type=doc_type
+                            )
+                            # Use enhanced evaluator
+                            result = await aevaluate_criterion_enhanced(
+                                criterion, context, pages, possible_answer
+                            )
+                        else:
+                            # Fall back to standard retrieval and evaluation
+                            context, pages = await search_relevant_context(
+                                criterion=criterion,
+                                filename=document_name,
+                                doc_type=doc_type
+                            )
+                            result = await aevaluate_criterion(criterion, context, pages)
+                    
+                    results[i] = result
+                    
+                    tracker.finish_criterion(
                         criterion=criterion,
-                        filename=document_name,
-                        doc_type=doc_type
+                        attempts=1,
+                        confidence=result.confidence
                     )
-                    result = evaluate_criterion(criterion, context, pages)
                 
-                results.append(result)
-                
-                tracker.finish_criterion(
-                    criterion=criterion,
-                    attempts=1,
-                    confidence=result.confidence
-                )
+                tracker.start_criterion()
+                status.update(f"[bold green]Evaluating {len(to_search)} criteria in parallel...")
+                await asyncio.gather(*(_evaluate_one(i) for i in to_search))
     
     tracker.finish_audit()
     
-    for i, result in enumerate(results):
-        criterion_config = criteria[i]
-        if isinstance(criterion_config, dict):
-            criterion_query = criterion_config["query"]
-        else:
-            criterion_query = criterion_config
-        tracker.finish_criterion(
-            criterion=criterion_query,
-            attempts=1,
-            confidence=result.confidence
-        )
-    
     if display_metrics:
         tracker.get_metrics().display_summary()
     
@@ -166,8 +203,110 @@ async def run_audit(
     )
 
 
+def _absent_from_possible_answer(possible_answer: PossibleAnswer) -> CriterionResult:
+    """Builds an ABSENT result for a criterion the full-document analysis did not find."""
+    return CriterionResult(
+        criterion=possible_answer.criterion,
+        status="ABSENT",
+        evidence=(
+            possible_answer.reasoning
+            or "Not found by the full-document analysis (possible answer); retrieval skipped."
+        ),
+        confidence=possible_answer.confidence,
+        pages=[]
+    )
+
+
+async def _run_deep_search(
+    agent: DeepResearchAgent,
+    states: list[SearchState],
+    tracker: MetricsTracker | None = None
+) -> list[CriterionResult]:
+    """
+    Drives the deep search of all criteria in lockstep.
+    
+    Each tick runs one attempt per pending criterion concurrently (bounded by
+    AUDIT_CONCURRENCY), then generates the alternative queries of every
+    criterion still below its confidence threshold with a single batched
+    LLM call. Criteria are recorded in the tracker as soon as they finish.
+    
+    Args:
+        agent: Agent bound to the audited document
+        states: One search state per criterion
+        tracker: Optional metrics tracker
+    
+    Returns:
+        List of CriterionResult in the same order as states
+    """
+    results: list[CriterionResult | None] = [None] * len(states)
+    queries: dict[int, str | None] = {i: None for i in range(len(states))}
+    pending = list(range(len(states)))
+    sem = asyncio.Semaphore(AUDIT_CONCURRENCY)
+    
+    async def _attempt(i: int) -> tuple[int, CriterionResult]:
+        async with sem:
+            return i, await agent.run_attempt(states[i], queries[i])
+    
+    def _finish(i: int) -> None:
+        if tracker is not None:
+            tracker.finish_criterion(
+                criterion=states[i].original_criterion,
+                attempts=states[i].attempts,
+                confidence=results[i].confidence
+            )
+    
+    while pending:
+        retry = []
+        for next_attempt in asyncio.as_completed([_attempt(i) for i in pending]):
+            i, result = await next_attempt
+            state = states[i]
+            results[i] = result
+            label = state.original_criterion[:40]
+            
+            if result.status == "ERROR":
+                log(f"[red]  ✗ {label}... {result.evidence}[/red]")
+                _finish(i)
+            elif result.confidence >= state.min_confidence:
+                log(f"[green]  ✓ {label}... found on attempt {state.attempts}[/green]")
+                _finish(i)
+            elif state.attempts < state.max_attempts:
+                log(
+                    f"[yellow]  ↻ {label}... attempt {state.attempts}: "
+                    f"confidence {result.confidence:.0%}, searching more...[/yellow]"
+                )
+                retry.append(i)
+            else:
+                _finish(i)
+        
+        # Keep the batched prompt stable regardless of completion order
+        retry.sort()
+        alternatives = await agent.generate_alternative_queries_batch(
+            [states[i] for i in retry]
+        )
+        
+        pending = []
+        for i, query in zip(retry, alternatives):
+            # If couldn't generate new query, keep the last evaluation
+            if states[i].has_executed(query):
+                _finish(i)
+                continue
+            queries[i] = query
+            pending.append(i)
+    
+    return results
+
+
+@functools.lru_cache(maxsize=1)
+def _pdf_index() -> dict[str, str]:
+    """Maps file names in the pdfs/ folder to their paths, scanned once."""
+    if not os.path.isdir("pdfs"):
+        return {}
+    with os.scandir("pdfs") as entries:
+        return {e.name: e.path for e in entries}
+
+
 async def _generate_possible_answers(
-    criteria: list,
+    criteria: list[CriterionSpec],
     pdf_path: str | None,
     document_name: str
 ) -> dict[str, PossibleAnswer]:
@@ -175,29 +314,19 @@ async def _generate_possible_answers(
     Generates possible answers for all criteria before evaluation.
     
     Args:
-        criteria: List of audit criteria (can be strings or dicts with 'query' key)
+        criteria: Normalized audit criteria
         pdf_path: Path to the PDF file
         document_name: PDF filename (used to find PDF if pdf_path not provided)
     
     Returns:
         Dict mapping criterion query to PossibleAnswer
     """
-    from .raw_extractor import RawPDFExtractor, PDFExtractionError
-    from .possible_answer_generator import PossibleAnswerGenerator
-    
-    # Resolve PDF path
-    resolved_path = pdf_path
-    if not resolved_path:
-        # Try common locations
-        possible_paths = [
-            Path(f"pdfs/{document_name}"),
-            Path(document_name),
-            Path(f"./pdfs/{document_name}"),
-        ]
-        for p in possible_paths:
-            if p.exists():
-                resolved_path = str(p)
-                break
+    # Resolve PDF path: explicit path, then the pdfs/ folder, then as given
+    resolved_path = (
+        pdf_path
+        or _pdf_index().get(document_name)
+        or (document_name if os.path.exists(document_name) else None)
+    )
     
     if not resolved_path:
         console.print(
@@ -209,7 +338,8 @@ async def _generate_possible_answers(
     # Extract raw PDF content
     try:
         extractor = RawPDFExtractor()
-        pdf_content = extractor.extract_full_text(resolved_path)
+        # Parse off the event loop so the agent warmup keeps progressing
+        pdf_content = await asyncio.to_thread(extractor.extract_full_text, resolved_path)
         console.print(
             f"[green]Extracted {pdf_content.total_pages} pages from PDF for possible answer generation[/green]"
         )
@@ -220,29 +350,33 @@ async def _generate_possible_answers(
         )
         return {}
     
-    # Extract criterion queries from criteria list
-    criterion_queries = []
-    for criterion_config in criteria:
-        if isinstance(criterion_config, dict):
-            criterion_queries.append(criterion_config["query"])
-        else:
-            criterion_queries.append(criterion_config)
+    criterion_queries = [c.query for c in criteria]
     
     # Generate possible answers
     try:
         generator = PossibleAnswerGenerator()
         console.print(f"[cyan]Generating possible answers for {len(criterion_queries)} criteria...[/cyan]")
         
-        possible_answers = await generator.generate_answers_batch(
-            criteria=criterion_queries,
-            pdf_content=pdf_content
-        )
+        possible_answers: dict[str, PossibleAnswer] = {}
+        found_count = 0
+        failed_count = 0
+        async for criterion, answer in generator.iter_answers(criterion_queries, pdf_content):
+            if answer.error:
+                # No usable analysis: audit this criterion without a hint
+                failed_count += 1
+                continue
+            possible_answers[criterion] = answer
+            found_count += answer.found
         
         # Log summary
-        found_count = sum(1 for pa in possible_answers.values() if pa.found)
         console.print(
             f"[green]Generated possible answers: {found_count}/{len(criterion_queries)} criteria have hints[/green]"
         )
+        if failed_count:
+            console.print(
+                f"[yellow]Possible answer generation failed for {failed_count} criteria; "
+                f"they are audited without hints[/yellow]"
+            )
         
         return possible_answers
         
@@ -4,7 +4,9 @@
 import os
 import sys
 import warnings
+from dataclasses import dataclass
 from pathlib import Path
+import torch
 from transformers import logging as transformers_logging
 
 # Silence tokenizer warnings
@@ -12,7 +14,7 @@ transformers_logging.set_verbosity_error()
 warnings.filterwarnings("ignore", message=".*XLMRobertaTokenizerFast.*")
 
 from dotenv import load_dotenv
-from pymilvus import connections, Collection
+from pymilvus import connections, utility, Collection, LoadState
 from pymilvus.model.hybrid import BGEM3EmbeddingFunction
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -23,6 +25,41 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 env_path = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(env_path)
 
+# =============================================================================
+# AUDIT CRITERIA
+# =============================================================================
+
+@dataclass(slots=True, frozen=True)
+class CriterionSpec:
+    """A single audit criterion and its required confidence."""
+    query: str
+    confidence: float = 0.7
+
+
+def normalize_criteria(criteria: list) -> list[CriterionSpec]:
+    """
+    Converts criteria given as strings, dicts or specs into CriterionSpec.
+    
+    Args:
+        criteria: List of query strings, {"query", "confidence"} dicts,
+            or objects with query/confidence attributes
+    
+    Returns:
+        List of CriterionSpec
+    """
+    specs = []
+    for c in criteria:
+        if isinstance(c, CriterionSpec):
+            specs.append(c)
+        elif isinstance(c, str):
+            specs.append(CriterionSpec(query=c))
+        elif isinstance(c, dict):
+            specs.append(CriterionSpec(query=c["query"], confidence=c.get("confidence", 0.7)))
+        else:
+            specs.append(CriterionSpec(query=c.query, confidence=c.confidence))
+    return specs
+
+
 # =============================================================================
 # TRY TO LOAD FROM YAML CONFIG
 # =============================================================================
@@ -38,10 +75,7 @@ try:
     OUTPUT_DIR = Path(_config.output.directory)
     
     # Convert criteria from config
-    AUDIT_CRITERIA = [
-        {"query": c.query, "confidence": c.confidence}
-        for c in _config.audit_criteria
-    ]
+    AUDIT_CRITERIA = normalize_criteria(_config.audit_criteria)
     
     # Possible answers configuration
     POSSIBLE_ANSWERS_ENABLED = _config.possible_answers.enabled
@@ -57,14 +91,14 @@ except (ImportError, FileNotFoundError):
     OUTPUT_DIR = Path(os.environ.get("OUTPUT_DIR", "./output"))
     
     AUDIT_CRITERIA = [
-        {"query": "Is there a registered CNPJ for the Brokerage?", "confidence": 0.8},
-        {"query": "Is there a confidentiality or secrecy clause?", "confidence": 0.7},
-        {"query": "Does the document mention values, fees, or compensation?", "confidence": 0.7},
-        {"query": "Is there a definition of classical music process?", "confidence": 0.6},
-        {"query": "Is there mention of the Settlement process?", "confidence": 0.7},
-        {"query": "Does the contract mention obligations of the parties?", "confidence": 0.7},
-        {"query": "Is there mention of penalties or fines?", "confidence": 0.7},
-        {"query": "Does the document have any mention about A5X?", "confidence": 0.8},
+        CriterionSpec("Is there a registered CNPJ for the Brokerage?", 0.8),
+        CriterionSpec("Is there a confidentiality or secrecy clause?", 0.7),
+        CriterionSpec("Does the document mention values, fees, or compensation?", 0.7),
+        CriterionSpec("Is there a definition of classical music process?", 0.6),
+        CriterionSpec("Is there mention of the Settlement process?", 0.7),
+        CriterionSpec("Does the contract mention obligations of the parties?", 0.7),
+        CriterionSpec("Is there mention of penalties or fines?", 0.7),
+        CriterionSpec("Does the document have any mention about A5X?", 0.8),
     ]
     
     # Possible answers disabled by default in fallback
@@ -81,12 +115,33 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 connections.connect(uri=MILVUS_URI)
 
+
+def ensure_loaded(col: Collection) -> None:
+    """Loads a collection unless the server already has it in memory."""
+    if utility.load_state(col.name) != LoadState.Loaded:
+        col.load()
+
+
 # =============================================================================
 # EMBEDDING MODELS
 # =============================================================================
 
+# Use the GPU in FP16 when available; override with EF_DEVICE / EF_FP16.
+# On CPU-only hosts, torch is allowed to use every core.
+EF_DEVICE = os.environ.get("EF_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+EF_FP16 = os.environ.get("EF_FP16", "1" if EF_DEVICE.startswith("cuda") else "0") == "1"
+
+if EF_DEVICE == "cpu":
+    torch.set_num_threads(os.cpu_count() or 1)
+
 # BGE-M3 provides both sparse and dense embeddings
-ef_bgem3 = BGEM3EmbeddingFunction(use_fp16=False, device="cpu")
+ef_bgem3 = BGEM3EmbeddingFunction(use_fp16=EF_FP16, device=EF_DEVICE)
+
+
+def warm_up_embeddings() -> None:
+    """Runs one query embedding so the first criterion does not pay for kernel initialization."""
+    ef_bgem3.encode_queries(["warmup"])
+
 
 # For query embedding, we use the same BGE-M3 model
 ef_dense = ef_bgem3
@@ -100,11 +155,43 @@ ef_sparse = ef_bgem3
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
 
+# Bounds how many LLM requests the agents keep in flight at once
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "16"))
+
+# Schema of a criterion evaluation, enforced by Gemini structured output
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": {"type": "string", "enum": ["PRESENT", "ABSENT"]},
+        "evidence": {
+            "type": "string",
+            "description": "Exact quote from the document in its original language, or brief explanation if absent"
+        },
+        "confidence": {"type": "number", "description": "0.0 to 1.0"},
+        "relevant_pages": {"type": "array", "items": {"type": "integer"}},
+    },
+    "required": ["status", "evidence", "confidence", "relevant_pages"],
+}
+
+# Same model, constrained to answer with JSON matching EVALUATION_SCHEMA
+llm_json = ChatGoogleGenerativeAI(
+    model="gemini-2.5-flash",
+    temperature=0,
+    response_mime_type="application/json",
+    response_schema=EVALUATION_SCHEMA
+)
+
 
 # =============================================================================
 # HELPER FUNCTIONS FOR RUNTIME CONFIG UPDATES
 # =============================================================================
 
+def reconnect_milvus() -> None:
+    """Drops and re-opens the default Milvus connection (e.g. after a server restart)."""
+    connections.disconnect("default")
+    connections.connect(uri=MILVUS_URI)
+
+
 def update_config(
     milvus_uri: str = None,
     collection_name: str = None,
@@ -122,7 +209,9 @@ def update_config(
     """
     global MILVUS_URI, COLLECTION_NAME, OUTPUT_DIR, AUDIT_CRITERIA
     
-    if milvus_uri:
+    if milvus_uri and milvus_uri != MILVUS_URI:
+        # Reconnect only on an actual change: the pipeline calls this before
+        # every audit and the connection may be in use
         MILVUS_URI = milvus_uri
         connections.disconnect("default")
         connections.connect(uri=milvus_uri)
@@ -135,4 +224,4 @@ def update_config(
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
     if audit_criteria:
-        AUDIT_CRITERIA = audit_criteria
+        AUDIT_CRITERIA = normalize_criteria(audit_criteria)
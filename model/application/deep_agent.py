@@ -1,31 +1,189 @@
 # deep_agent.py - Deep Research Agent for Auditing
 # ============================================================================
 
+import asyncio
+import bisect
+import re
+import time
+import weakref
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
-from rich.console import Console
 
-from .config import llm
-from .retriever import search_relevant_context
+from .config import llm, llm_json, COLLECTION_NAME, LLM_CONCURRENCY
+from .enhanced_retriever import search_chunks_with_possible_answer
+from .json_utils import parse_llm_json
+from .llm_cache import cached_ainvoke
+from .progress_log import log
+from .retriever import (
+    build_filter,
+    format_chunks,
+    generate_query_embeddings,
+    generate_query_embeddings_batch,
+    get_collection,
+    search_relevant_chunks,
+    search_relevant_context_batch,
+)
 from .models import CriterionResult
 
 if TYPE_CHECKING:
     from .possible_answer_models import PossibleAnswer
 
-console = Console()
+# One semaphore per event loop: asyncio primitives bind to the loop that
+# first waits on them, and each asyncio.run() starts a new loop
+_llm_sems: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
 
-@dataclass
+def _llm_sem() -> asyncio.Semaphore:
+    """Returns the LLM concurrency semaphore of the running event loop."""
+    loop = asyncio.get_running_loop()
+    sem = _llm_sems.get(loop)
+    if sem is None:
+        sem = _llm_sems[loop] = asyncio.Semaphore(LLM_CONCURRENCY)
+    return sem
+
+
+async def _ainvoke(prompt: str, model=llm, system: str | None = None, parse=None):
+    """
+    Invokes the LLM without blocking the event loop, reusing cached responses.
+    
+    With parse, returns its result; only responses it accepts are cached.
+    """
+    async with _llm_sem():
+        start = time.perf_counter()
+        result = await cached_ainvoke(model, prompt, system, parse)
+        log(f"[dim]  LLM call took {time.perf_counter() - start:.2f}s[/dim]")
+        return result
+
+
+# Static prompt sections, built once at import. Instructions go in system
+# blocks so the cacheable prefix comes before any per-criterion content.
+_ALT_QUERY_SYSTEM_PROMPT = """You are searching for information in a document to verify an audit criterion.
+Generate ONE alternative search query to find this information.
+Use synonyms, related terms, or different approaches.
+If a hint from the initial document analysis is given, use it to find the relevant information.
+
+Respond ONLY with the query, without explanations."""
+
+_ALT_QUERY_BATCH_SYSTEM_PROMPT = """You are searching for information in a document to verify several criteria.
+For each numbered criterion, generate ONE alternative search query to find its information.
+Use synonyms, related terms, or different approaches, and use the hints when available.
+
+Respond only in valid JSON, without markdown and without additional text:
+{"alternatives": ["query for [0]", "query for [1]", ...]}"""
+
+_ALT_QUERY_HINT_HEAD = "\nHint from initial document analysis:\n"
+
+_EVAL_HINT_HEAD = "\nLLM POSSIBLE ANSWER (hint from initial analysis - verify against document):\n"
+
+_EVAL_HINT_TAIL = """
+IMPORTANT: The possible answer is just a hint. ALWAYS verify against the actual document excerpts above.
+DO NOT use text from the possible answer as evidence - only use actual document text.
+"""
+
+# Evaluation instructions, sent as a byte-identical system block so the
+# provider can serve them from its prompt cache
+_EVAL_SYSTEM_PROMPT = """You are a rigorous compliance auditor analyzing a document.
+
+CRITICAL RULES:
+1. Evaluate if the criterion is PRESENT or ABSENT in the document
+2. The "evidence" field MUST contain the EXACT excerpt copied from the document
+3. DO NOT paraphrase, DO NOT translate, DO NOT summarize - copy the text EXACTLY as it appears
+4. Keep the original language of the document (Portuguese) in the evidence field
+5. If the criterion is ABSENT, briefly explain why in English
+6. Be precise about which pages contain the evidence"""
+
+
+def _sorted_unique(pages: list[int]) -> list[int]:
+    """Returns pages sorted without duplicates, skipping the sort if already so."""
+    if all(a < b for a, b in zip(pages, pages[1:])):
+        return list(pages)
+    return sorted(set(pages))
+
+
+# Chunk counts per (collection_name, filename), shared by all agents
+_TOTAL_CHUNKS_CACHE: dict[tuple[str, str], int] = {}
+
+
+def count_document_chunks(filename: str, collection_name: str | None = None) -> int:
+    """
+    Counts the chunks indexed for a document (blocking Milvus call).
+    
+    Args:
+        filename: Indexed PDF filename
+        collection_name: Override for collection name
+    
+    Returns:
+        Number of chunks, or 100 if the collection cannot be queried
+    """
+    try:
+        col_name = collection_name or COLLECTION_NAME
+        key = (col_name, filename)
+        if key in _TOTAL_CHUNKS_CACHE:
+            return _TOTAL_CHUNKS_CACHE[key]
+        col = get_collection(col_name)
+        expr, expr_params = build_filter(filename, None) or ("", None)
+        try:
+            # Server-side count (Milvus >= 2.3) returns a single row
+            results = col.query(expr=expr, expr_params=expr_params, output_fields=["count(*)"])
+            total = int(results[0]["count(*)"])
+        except Exception:
+            results = col.query(expr=expr, expr_params=expr_params, output_fields=["pk"], limit=10000)
+            total = len(results)
+        _TOTAL_CHUNKS_CACHE[key] = total
+        return total
+    except Exception:
+        return 100
+
+
+def clear_chunk_count_cache(collection_name: str | None = None) -> None:
+    """
+    Forgets cached chunk counts (call after re-indexing).
+    
+    Args:
+        collection_name: Only forget counts of this collection (default: all)
+    """
+    if collection_name is None:
+        _TOTAL_CHUNKS_CACHE.clear()
+        return
+    for key in [k for k in _TOTAL_CHUNKS_CACHE if k[0] == collection_name]:
+        del _TOTAL_CHUNKS_CACHE[key]
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _query_signature(query: str) -> frozenset[str]:
+    """Normalizes a query to its lowercase word set."""
+    return frozenset(_WORD_RE.findall(query.lower()))
+
+
+@dataclass(slots=True)
 class SearchState:
     """Current state of the agent's search."""
     original_criterion: str
     executed_queries: list[str] = field(default_factory=list)
     found_contexts: list[dict] = field(default_factory=list)
     found_pages: set[int] = field(default_factory=set)
+    found_pages_sorted: list[int] = field(default_factory=list)
+    seen_chunks: set = field(default_factory=set)
     attempts: int = 0
     max_attempts: int = 3
     min_confidence: float = 0.9
     possible_answer: "PossibleAnswer | None" = None
+    running_summary: str = ""
+    last_result: CriterionResult | None = None
+    
+    def add_pages(self, pages: list[int]) -> None:
+        """Records found pages, keeping found_pages_sorted ordered."""
+        for page in pages:
+            if page not in self.found_pages:
+                self.found_pages.add(page)
+                bisect.insort(self.found_pages_sorted, page)
+    
+    def has_executed(self, query: str) -> bool:
+        """Checks if an equivalent query (same words, any case/order) already ran."""
+        signature = _query_signature(query)
+        return any(_query_signature(q) == signature for q in self.executed_queries)
 
 
 class DeepResearchAgent:
@@ -43,6 +201,15 @@ class DeepResearchAgent:
     - Provide hints in evaluation prompts
     """
     
+    __slots__ = (
+        "filename",
+        "doc_type",
+        "collection_name",
+        "total_chunks",
+        "_possible_answers",
+        "_possible_answer_embeddings",
+    )
+    
     def __init__(
         self, 
         filename: str, 
@@ -53,103 +220,229 @@ class DeepResearchAgent:
         self.filename = filename
         self.doc_type = doc_type
         self.collection_name = collection_name
-        self.possible_answers = possible_answers or {}
-        self.total_chunks = self._get_total_chunks()
+        self._possible_answers = possible_answers or {}
+        self._possible_answer_embeddings: dict[str, dict] = {}
+        self.total_chunks: int | None = None
     
-    def _get_total_chunks(self) -> int:
-        """Get document size for dynamic limits."""
-        try:
-            from pymilvus import Collection
-            from .config import COLLECTION_NAME
-            col_name = self.collection_name or COLLECTION_NAME
-            col = Collection(col_name)
-            col.load()
-            results = col.query(
-                expr=f'filename == "{self.filename}"',
-                output_fields=["pk"],
-                limit=10000
+    @property
+    def possible_answers(self) -> dict[str, "PossibleAnswer"]:
+        """Possible answers keyed by criterion."""
+        return self._possible_answers
+    
+    async def set_possible_answers(self, possible_answers: dict[str, "PossibleAnswer"] | None) -> None:
+        """
+        Sets the possible answers and embeds every usable one in a single batch.
+        
+        The embeddings are computed off the event loop, so attempts do not
+        recompute them.
+        
+        Args:
+            possible_answers: Possible answers keyed by criterion
+        """
+        self._possible_answers = possible_answers or {}
+        answers = list(dict.fromkeys(
+            pa.answer
+            for pa in self._possible_answers.values()
+            if pa.found and pa.answer.strip()
+        ))
+        embeddings = (
+            await asyncio.to_thread(generate_query_embeddings_batch, answers) if answers else []
+        )
+        self._possible_answer_embeddings = dict(zip(answers, embeddings))
+    
+    async def _answer_embeddings(self, possible_answer: "PossibleAnswer") -> dict:
+        """Returns the embeddings of a possible answer, computing them on first use."""
+        embeddings = self._possible_answer_embeddings.get(possible_answer.answer)
+        if embeddings is None:
+            embeddings = await asyncio.to_thread(generate_query_embeddings, possible_answer.answer)
+            self._possible_answer_embeddings[possible_answer.answer] = embeddings
+        return embeddings
+    
+    async def ensure_ready(self) -> None:
+        """Loads the document size for dynamic limits without blocking the event loop."""
+        if self.total_chunks is None:
+            self.total_chunks = await asyncio.to_thread(
+                count_document_chunks, self.filename, self.collection_name
             )
-            return len(results)
-        except:
-            return 100
     
     def _calculate_dynamic_limit(self) -> int:
         """Calculate dynamic retrieval limit based on document size."""
-        return min(10, max(3, self.total_chunks // 100))
+        total_chunks = self.total_chunks if self.total_chunks is not None else 100
+        return min(10, max(3, total_chunks // 100))
     
-    async def search(self, criterion: str, min_confidence: float | None = None) -> CriterionResult:
+    def start_search(self, criterion: str, min_confidence: float | None = None) -> SearchState:
         """
-        Executes deep search for a criterion.
+        Creates the search state for a criterion.
         
         Args:
             criterion: Criterion to be evaluated
             min_confidence: Specific confidence threshold
         
         Returns:
-            CriterionResult with the best evaluation found
+            SearchState ready for the first attempt
         """
-        # Get possible answer for this criterion if available
-        possible_answer = self.possible_answers.get(criterion)
-        
         state = SearchState(
             original_criterion=criterion,
-            min_confidence=min_confidence,
-            possible_answer=possible_answer
+            possible_answer=self.possible_answers.get(criterion)
         )
+        if min_confidence is not None:
+            state.min_confidence = min_confidence
+        return state
+    
+    async def prefetch_initial_contexts(self, states: list[SearchState]) -> None:
+        """
+        Fetches the first-attempt context of several criteria in one search.
+        
+        Only criteria served by the plain retriever are batched; results are
+        memoized, so the following run_attempt calls reuse them.
+        
+        Args:
+            states: Search states before their first attempt
+        """
+        await self.ensure_ready()
+        
+        queries = [
+            self._get_initial_query(state.original_criterion, state.possible_answer)
+            for state in states
+            if not (state.possible_answer and state.possible_answer.found)
+        ]
+        if not queries:
+            return
+        
+        await search_relevant_context_batch(
+            criteria=queries,
+            limit=self._calculate_dynamic_limit(),
+            filename=self.filename,
+            doc_type=self.doc_type
+        )
+    
+    async def run_attempt(self, state: SearchState, query: str | None = None) -> CriterionResult:
+        """
+        Runs one search attempt and evaluates all context accumulated so far.
+        
+        Args:
+            state: Search state of the criterion
+            query: Query to search with (defaults to the initial query)
+        
+        Returns:
+            CriterionResult for the accumulated context
+        """
+        await self.ensure_ready()
+        
+        if query is None:
+            query = self._get_initial_query(state.original_criterion, state.possible_answer)
+        
+        state.attempts += 1
+        state.executed_queries.append(query)
+        
+        # Fold the previous attempt's context into the running summary
+        # while the new search runs
+        if state.found_contexts:
+            summary, chunks = await asyncio.gather(
+                self._summarize_context(state),
+                self._retrieve(query, state.possible_answer)
+            )
+            state.running_summary = summary
+        else:
+            chunks = await self._retrieve(query, state.possible_answer)
+        
+        # Only chunks not seen in earlier attempts reach the prompts; the
+        # earlier ones are already folded into the running summary
+        new_chunks = [c for c in chunks if c["pk"] not in state.seen_chunks]
+        state.seen_chunks.update(c["pk"] for c in new_chunks)
+        context, pages = format_chunks(new_chunks)
         
+        # Store results
+        state.found_contexts.append({
+            "query": query,
+            "chunks": new_chunks,
+            "context": context,
+            "preview": context[:200] + "...",
+            "pages": pages
+        })
+        state.add_pages(pages)
+        
+        # Hybrid search returns the nearest chunks whenever the document has
+        # any, so an empty first search means nothing is indexed under this
+        # filename (not indexed yet, or a name mismatch). That is an error,
+        # not evidence of absence; retrying with other queries cannot help.
+        if (
+            state.attempts == 1
+            and not chunks
+            and not (state.possible_answer and state.possible_answer.found)
+        ):
+            state.last_result = CriterionResult(
+                criterion=state.original_criterion,
+                status="ERROR",
+                evidence=f"No indexed chunks found for document '{self.filename}'.",
+                confidence=0.0,
+                pages=[]
+            )
+            return state.last_result
+        
+        # Evaluate with the running summary plus the new context
+        state.last_result = await self._evaluate_with_accumulated_context(state)
+        return state.last_result
+    
+    async def _retrieve(
+        self,
+        query: str,
+        possible_answer: "PossibleAnswer | None"
+    ) -> list[dict]:
+        """Searches chunks - uses enhanced retriever if possible answer available."""
         limit = self._calculate_dynamic_limit()
         
+        if possible_answer and possible_answer.found:
+            return await self._search_with_possible_answer(
+                query=query,
+                possible_answer=possible_answer,
+                limit=limit
+            )
+        
+        return await search_relevant_chunks(
+            criterion=query,
+            limit=limit,
+            filename=self.filename,
+            doc_type=self.doc_type
+        )
+    
+    async def search(self, criterion: str, min_confidence: float | None = None) -> CriterionResult:
+        """
+        Executes deep search for a criterion.
+        
+        Args:
+            criterion: Criterion to be evaluated
+            min_confidence: Specific confidence threshold
+        
+        Returns:
+            CriterionResult with the best evaluation found
+        """
+        state = self.start_search(criterion, min_confidence)
+        
         while state.attempts < state.max_attempts:
-            state.attempts += 1
-            
-            # Define query for this iteration
-            if state.attempts == 1:
-                # On first attempt, use possible answer to enhance query if available
-                query = self._get_initial_query(criterion, possible_answer)
-            else:
+            # Define query for this iteration (the first attempt uses the initial query)
+            query = None
+            if state.attempts > 0:
                 query = await self._generate_alternative_query(state)
                 
                 # If couldn't generate new query, stop
-                if query in state.executed_queries:
+                if state.has_executed(query):
                     break
             
-            state.executed_queries.append(query)
-            
-            # Search context - use enhanced retriever if possible answer available
-            if possible_answer and possible_answer.found:
-                context, pages = await self._search_with_possible_answer(
-                    query=query,
-                    possible_answer=possible_answer,
-                    limit=limit
-                )
-            else:
-                context, pages = await search_relevant_context(
-                    criterion=query,
-                    limit=limit,
-                    filename=self.filename,
-                    doc_type=self.doc_type
-                )
-            
-            # Store results
-            state.found_contexts.append({
-                "query": query,
-                "context": context,
-                "pages": pages
-            })
-            state.found_pages.update(pages)
+            result = await self.run_attempt(state, query)
             
-            # Evaluate with all accumulated context
-            result = await self._evaluate_with_accumulated_context(state)
+            if result.status == "ERROR":
+                return result
             
             # If sufficient confidence, return
             if result.confidence >= state.min_confidence:
-                console.print(f"[green]  ✓ Found on attempt {state.attempts}[/green]")
+                log(f"[green]  ✓ Found on attempt {state.attempts}[/green]")
                 return result
             
-            console.print(f"[yellow]  ↻ Attempt {state.attempts}: confidence {result.confidence:.0%}, searching more...[/yellow]")
+            log(f"[yellow]  ↻ Attempt {state.attempts}: confidence {result.confidence:.0%}, searching more...[/yellow]")
         
-        # Return best result found
-        return await self._evaluate_with_accumulated_context(state)
+        # The last attempt already evaluated the full accumulated state
+        return state.last_result
     
     def _get_initial_query(self, criterion: str, possible_answer: "PossibleAnswer | None") -> str:
         """
@@ -170,124 +463,181 @@ class DeepResearchAgent:
         query: str,
         possible_answer: "PossibleAnswer",
         limit: int
-    ) -> tuple[str, list[int]]:
+    ) -> list[dict]:
         """
         Search using the enhanced retriever with possible answer support.
         """
-        from .enhanced_retriever import search_with_possible_answer
-        
-        return await search_with_possible_answer(
+        return await search_chunks_with_possible_answer(
             criterion=query,
             possible_answer=possible_answer,
             filename=self.filename,
             doc_type=self.doc_type,
-            limit=limit
+            limit=limit,
+            answer_embeddings=await self._answer_embeddings(possible_answer)
         )
     
     async def _generate_alternative_query(self, state: SearchState) -> str:
         """Generates an alternative query based on history and possible answer hints."""
         
+        parts = [
+            'CRITERION:\n"', state.original_criterion, '"\n\n',
+            "Queries already tried (do not repeat):\n",
+            "\n".join(f"- {q}" for q in state.executed_queries),
+            "\n\nContexts found so far:\n",
+            "\n".join(c["preview"] for c in state.found_contexts),
+            "\n",
+        ]
+        
         # Include possible answer hint if available
-        possible_answer_hint = ""
         if state.possible_answer and state.possible_answer.found and state.possible_answer.answer:
-            possible_answer_hint = f"""
-Hint from initial document analysis:
-{state.possible_answer.answer}
-Suggested pages: {state.possible_answer.relevant_pages}
+            parts += [
+                _ALT_QUERY_HINT_HEAD,
+                state.possible_answer.answer,
+                "\nSuggested pages: ", str(state.possible_answer.relevant_pages), "\n",
+            ]
+        
+        prompt = "".join(parts)
 
-Use this hint to generate better search queries that might find the relevant information.
-"""
+        content = await _ainvoke(prompt, system=_ALT_QUERY_SYSTEM_PROMPT)
+        return content.strip()
+    
+    async def generate_alternative_queries_batch(self, states: list[SearchState]) -> list[str]:
+        """
+        Generates one alternative query per criterion with a single LLM call.
+        
+        Falls back to one call per criterion if the batched response
+        cannot be parsed.
         
-        prompt = f"""You are searching for information in a document to verify this criterion:
+        Args:
+            states: Search states of the criteria that need another attempt
+        
+        Returns:
+            List of alternative queries, in the same order as states
+        """
+        if not states:
+            return []
+        if len(states) == 1:
+            return [await self._generate_alternative_query(states[0])]
+        
+        sections = []
+        for i, state in enumerate(states):
+            section = (
+                f"[{i}] CRITERION: \"{state.original_criterion}\"\n"
+                f"Queries already tried (do not repeat):\n"
+                + "\n".join(f"- {q}" for q in state.executed_queries)
+                + "\nContexts found so far:\n"
+                + "\n".join(c["preview"] for c in state.found_contexts)
+            )
+            if state.possible_answer and state.possible_answer.found and state.possible_answer.answer:
+                section += (
+                    f"\nHint from initial document analysis: {state.possible_answer.answer}"
+                    f"\nSuggested pages: {state.possible_answer.relevant_pages}"
+                )
+            sections.append(section)
+        
+        prompt = "\n\n".join(sections)
+
+        def parse_alternatives(content: str) -> list[str]:
+            alternatives = [str(q).strip() for q in parse_llm_json(content)["alternatives"]]
+            if len(alternatives) != len(states):
+                raise ValueError(f"expected {len(states)} queries, got {len(alternatives)}")
+            return alternatives
+        
+        try:
+            return await _ainvoke(
+                prompt, system=_ALT_QUERY_BATCH_SYSTEM_PROMPT, parse=parse_alternatives
+            )
+        except (ValueError, KeyError, TypeError):
+            pass
+        
+        log("[yellow]  ⚠ Batched query generation failed, generating one by one...[/yellow]")
+        return list(await asyncio.gather(
+            *(self._generate_alternative_query(state) for state in states)
+        ))
+    
+    async def _summarize_context(self, state: SearchState) -> str:
+        """
+        Merges the latest retrieved context into the running summary.
+        
+        Keeps the evaluation prompt bounded: later attempts send the summary
+        plus only the newly retrieved context instead of every past context.
+        """
+        latest = state.found_contexts[-1]["context"]
+        if latest == "No context found.":
+            return state.running_summary
+        
+        prompt = f"""You are helping an auditor verify this criterion:
 "{state.original_criterion}"
 
-Queries already tried (do not repeat):
-{chr(10).join(f'- {q}' for q in state.executed_queries)}
+CURRENT SUMMARY OF PREVIOUS SEARCHES:
+{state.running_summary or "None"}
 
-Contexts found so far:
-{chr(10).join(c['context'][:200] + '...' for c in state.found_contexts)}
-{possible_answer_hint}
-Generate ONE alternative search query to find this information.
-Use synonyms, related terms, or different approaches.
+NEW DOCUMENT EXCERPTS:
+{latest}
 
-Respond ONLY with the query, without explanations."""
+Update the summary with the new excerpts in at most 200 tokens.
+Copy VERBATIM, in the original language, any sentence that could serve as evidence
+for the criterion, followed by its page number as (Page N).
+Drop information unrelated to the criterion.
+
+Respond ONLY with the updated summary."""
 
-        response = llm.invoke(prompt)
-        return response.content.strip()
+        content = await _ainvoke(prompt)
+        return content.strip()
     
     async def _evaluate_with_accumulated_context(self, state: SearchState) -> CriterionResult:
-        """Evaluates using all accumulated context from searches."""
+        """Evaluates using the running summary and the latest context."""
         
-        # Combine all unique contexts
-        full_context = "\n\n---\n\n".join(
-            c["context"] for c in state.found_contexts
-            if c["context"] != "No context found."
-        )
+        sections = []
+        if state.running_summary:
+            sections.append(f"Summary of earlier searches:\n{state.running_summary}")
+        
+        latest = state.found_contexts[-1]["context"] if state.found_contexts else "No context found."
+        if latest != "No context found.":
+            sections.append(f"Latest excerpts:\n{latest}")
+        
+        full_context = "\n\n---\n\n".join(sections)
         
         if not full_context:
             full_context = "No relevant context found after multiple searches."
         
+        parts = [
+            "CRITERION TO EVALUATE:\n",
+            state.original_criterion,
+            f"\n\nFULL CONTEXT (from {len(state.executed_queries)} searches):\n",
+            full_context,
+            "\n\nPAGES FOUND: ",
+            str(state.found_pages_sorted) if state.found_pages_sorted else "None",
+            "\n",
+        ]
+        
         # Include possible answer hint if available
-        possible_answer_section = ""
         if state.possible_answer and state.possible_answer.found and state.possible_answer.answer:
-            possible_answer_section = f"""
-LLM POSSIBLE ANSWER (hint from initial analysis - verify against document):
-{state.possible_answer.answer}
-Suggested pages: {state.possible_answer.relevant_pages}
-
-IMPORTANT: The possible answer is just a hint. ALWAYS verify against the actual document excerpts above.
-DO NOT use text from the possible answer as evidence - only use actual document text.
-"""
+            parts += [
+                _EVAL_HINT_HEAD,
+                state.possible_answer.answer,
+                "\nSuggested pages: ", str(state.possible_answer.relevant_pages), "\n",
+                _EVAL_HINT_TAIL,
+            ]
         
-        prompt = f"""You are a rigorous compliance auditor analyzing a document.
+        prompt = "".join(parts)
 
-    CRITERION TO EVALUATE:
-    {state.original_criterion}
-
-    FULL CONTEXT (from {len(state.executed_queries)} searches):
-    {full_context}
-
-    PAGES FOUND: {sorted(state.found_pages) if state.found_pages else 'None'}
-{possible_answer_section}
-    CRITICAL RULES:
-    1. Evaluate if the criterion is PRESENT or ABSENT in the document
-    2. The "evidence" field MUST contain the EXACT excerpt copied from the document
-    3. DO NOT paraphrase, DO NOT translate, DO NOT summarize - copy the text EXACTLY as it appears
-    4. Keep the original language of the document (Portuguese) in the evidence field
-    5. If the criterion is ABSENT, briefly explain why in English
-    6. Be precise about which pages contain the evidence
-
-    Respond in valid JSON:
-    {{
-        "status": "PRESENT" or "ABSENT",
-        "evidence": "EXACT QUOTE from the document in its original language (Portuguese), or brief explanation if absent",
-        "confidence": 0.0 to 1.0,
-        "relevant_pages": [list of pages]
-    }}"""
-
-
-        response = llm.invoke(prompt)
-        
-        try:
-            import json
-            content = (response.content
-                       .strip()
-                       .replace("```json", "")
-                       .replace("```", "")
-                       .strip())
-            
-            data = json.loads(content)
+        def parse_result(content: str) -> CriterionResult:
+            data = parse_llm_json(content)
             
-            pages = data.get("relevant_pages", list(state.found_pages))
+            pages = data.get("relevant_pages", state.found_pages_sorted)
             
             return CriterionResult(
                 criterion=state.original_criterion,
                 status=data.get("status", "ABSENT"),
                 evidence=data.get("evidence", ""),
                 confidence=float(data.get("confidence", 0.5)),
-                pages=sorted(set(pages)) if pages else []
+                pages=_sorted_unique(pages) if pages else []
             )
-        except Exception as e:
+        
+        try:
+            return await _ainvoke(prompt, llm_json, system=_EVAL_SYSTEM_PROMPT, parse=parse_result)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
             return CriterionResult(
                 criterion=state.original_criterion,
                 status="ERROR",
@@ -7,66 +7,94 @@ import json
 from typing import TYPE_CHECKING
 
 from .config import llm
+from .json_utils import parse_llm_json
+from .llm_cache import build_messages, record_usage
 from .models import CriterionResult
 
 if TYPE_CHECKING:
     from .possible_answer_models import PossibleAnswer
 
 
-def evaluate_criterion(criterion: str, context: str, pages: list[int]) -> CriterionResult:
-    """
-    Uses the LLM to evaluate if a criterion is present in the context.
-    
-    Args:
-        criterion: The criterion to be evaluated
-        context: Document excerpts retrieved from Milvus
-        pages: List of pages where the excerpts came from
-    
-    Returns:
-        CriterionResult with status, evidence, confidence, and pages
-    """
-    
-    prompt = f"""You are a rigorous compliance auditor analyzing a document.
-    Respond only in valid JSON, without markdown and without additional text.
+# Static instructions, kept byte-identical across calls so the provider can
+# serve them from its prompt cache; only the criterion and context vary
+AUDITOR_SYSTEM_PROMPT = """You are a rigorous compliance auditor analyzing a document.
+Respond only in valid JSON, without markdown and without additional text.
 
-    CRITERION TO EVALUATE:
-    {criterion}
+CRITICAL RULES:
+1. Carefully analyze if the criterion is PRESENT or ABSENT in the context
+2. The "evidence" field MUST contain the EXACT excerpt copied from the document
+3. DO NOT paraphrase, DO NOT translate, DO NOT summarize - copy the text EXACTLY as it appears
+4. Keep the original language of the document (Portuguese) in the evidence field
+5. If the criterion is ABSENT, briefly explain why in English
+6. Evaluate your confidence in the response (0.0 = none, 1.0 = total)
+7. Indicate which pages contain the evidence (use page numbers from context)
 
-    DOCUMENT CONTEXT (relevant retrieved excerpts):
-    {context}
+Respond EXACTLY in the JSON format below:
 
-    CRITICAL RULES:
-    1. Carefully analyze if the criterion is PRESENT or ABSENT in the context
-    2. The "evidence" field MUST contain the EXACT excerpt copied from the document
-    3. DO NOT paraphrase, DO NOT translate, DO NOT summarize - copy the text EXACTLY as it appears
-    4. Keep the original language of the document (Portuguese) in the evidence field
-    5. If the criterion is ABSENT, briefly explain why in English
-    6. Evaluate your confidence in the response (0.0 = none, 1.0 = total)
-    7. Indicate which pages contain the evidence (use page numbers from context)
+{
+    "status": "PRESENT" or "ABSENT",
+    "evidence": "EXACT QUOTE from the document in its original language, or brief explanation if absent",
+    "confidence": 0.0 to 1.0,
+    "relevant_pages": [list of page numbers where evidence was found]
+}"""
 
-    Respond EXACTLY in the JSON format below:
+AUDITOR_ENHANCED_SYSTEM_PROMPT = """You are a rigorous compliance auditor analyzing a document.
+Respond only in valid JSON, without markdown and without additional text.
 
-    {{
-        "status": "PRESENT" or "ABSENT",
-        "evidence": "EXACT QUOTE from the document in its original language, or brief explanation if absent",
-        "confidence": 0.0 to 1.0,
-        "relevant_pages": [list of page numbers where evidence was found]
-    }}
-    """
-    
-    response = llm.invoke(prompt)
+CRITICAL RULES:
+1. The DOCUMENT CONTEXT contains the actual evidence - use this as your primary source
+2. The LLM POSSIBLE ANSWER is just a hint - it may be incorrect or incomplete
+3. ALWAYS verify any claim from the possible answer against the actual document excerpts
+4. The "evidence" field MUST contain the EXACT excerpt copied from DOCUMENT CONTEXT
+5. DO NOT use text from the possible answer as evidence - only use actual document text
+6. Keep the original language of the document (Portuguese) in the evidence field
+7. If the criterion is ABSENT, briefly explain why in English
+8. Evaluate your confidence in the response (0.0 = none, 1.0 = total)
+9. Indicate which pages contain the evidence (use page numbers from context)
+
+Respond EXACTLY in the JSON format below:
+{
+    "status": "PRESENT" or "ABSENT",
+    "evidence": "EXACT QUOTE from DOCUMENT CONTEXT only",
+    "confidence": 0.0 to 1.0,
+    "relevant_pages": [list of page numbers]
+}"""
+
+
+def _build_prompt(criterion: str, context: str) -> str:
+    """Builds the per-call part of the standard evaluation."""
+    return f"""CRITERION TO EVALUATE:
+{criterion}
+
+DOCUMENT CONTEXT (relevant retrieved excerpts):
+{context}
+"""
+
+
+def _build_enhanced_prompt(criterion: str, context: str, possible_answer: PossibleAnswer) -> str:
+    """Builds the per-call part of the evaluation with a possible answer hint."""
+    possible_answer_text = possible_answer.answer if possible_answer.answer else "Not available"
+    suggested_pages = possible_answer.relevant_pages if possible_answer.relevant_pages else []
     
+    return f"""CRITERION TO EVALUATE:
+{criterion}
+
+DOCUMENT CONTEXT (actual excerpts from the document):
+{context}
+
+LLM POSSIBLE ANSWER (hint from initial analysis - verify against document):
+{possible_answer_text}
+Suggested pages: {suggested_pages}
+"""
+
+
+def _parse_result(criterion: str, content: str, pages: list[int]) -> CriterionResult:
+    """Converts the LLM JSON response into a CriterionResult."""
     try:
-        clean_content = (response.content
-                         .strip()
-                         .replace("```json", "")
-                         .replace("```", "")
-                         .strip())
-        
-        data = json.loads(clean_content)
+        data = parse_llm_json(content)
         
         result_pages = data.get("relevant_pages", pages)
-        result_pages = sorted(list(set(result_pages))) if result_pages else []
+        result_pages = sorted(set(result_pages)) if result_pages else []
         
         return CriterionResult(
             criterion=criterion,
@@ -86,6 +114,46 @@ def evaluate_criterion(criterion: str, context: str, pages: list[int]) -> Criter
         )
 
 
+def evaluate_criterion(criterion: str, context: str, pages: list[int]) -> CriterionResult:
+    """
+    Uses the LLM to evaluate if a criterion is present in the context.
+    
+    Args:
+        criterion: The criterion to be evaluated
+        context: Document excerpts retrieved from Milvus
+        pages: List of pages where the excerpts came from
+    
+    Returns:
+        CriterionResult with status, evidence, confidence, and pages
+    """
+    prompt = _build_prompt(criterion, context)
+    
+    response = llm.invoke(build_messages(AUDITOR_SYSTEM_PROMPT, prompt))
+    record_usage(response)
+    
+    return _parse_result(criterion, response.content, pages)
+
+
+async def aevaluate_criterion(criterion: str, context: str, pages: list[int]) -> CriterionResult:
+    """
+    Async version of evaluate_criterion that does not block the event loop.
+    
+    Args:
+        criterion: The criterion to be evaluated
+        context: Document excerpts retrieved from Milvus
+        pages: List of pages where the excerpts came from
+    
+    Returns:
+        CriterionResult with status, evidence, confidence, and pages
+    """
+    prompt = _build_prompt(criterion, context)
+    
+    response = await llm.ainvoke(build_messages(AUDITOR_SYSTEM_PROMPT, prompt))
+    record_usage(response)
+    
+    return _parse_result(criterion, response.content, pages)
+
+
 def evaluate_criterion_enhanced(
     criterion: str,
     context: str,
@@ -112,70 +180,39 @@ def evaluate_criterion_enhanced(
     if possible_answer is None or not possible_answer.found:
         return evaluate_criterion(criterion, context, pages)
     
-    # Build the enhanced prompt with both sources clearly separated
-    possible_answer_text = possible_answer.answer if possible_answer.answer else "Not available"
-    suggested_pages = possible_answer.relevant_pages if possible_answer.relevant_pages else []
+    prompt = _build_enhanced_prompt(criterion, context, possible_answer)
     
-    prompt = f"""You are a rigorous compliance auditor analyzing a document.
-Respond only in valid JSON, without markdown and without additional text.
-
-CRITERION TO EVALUATE:
-{criterion}
-
-DOCUMENT CONTEXT (actual excerpts from the document):
-{context}
-
-LLM POSSIBLE ANSWER (hint from initial analysis - verify against document):
-{possible_answer_text}
-Suggested pages: {suggested_pages}
+    response = llm.invoke(build_messages(AUDITOR_ENHANCED_SYSTEM_PROMPT, prompt))
+    record_usage(response)
+    
+    return _parse_result(criterion, response.content, pages)
 
-CRITICAL RULES:
-1. The DOCUMENT CONTEXT contains the actual evidence - use this as your primary source
-2. The LLM POSSIBLE ANSWER is just a hint - it may be incorrect or incomplete
-3. ALWAYS verify any claim from the possible answer against the actual document excerpts
-4. The "evidence" field MUST contain the EXACT excerpt copied from DOCUMENT CONTEXT
-5. DO NOT use text from the possible answer as evidence - only use actual document text
-6. Keep the original language of the document (Portuguese) in the evidence field
-7. If the criterion is ABSENT, briefly explain why in English
-8. Evaluate your confidence in the response (0.0 = none, 1.0 = total)
-9. Indicate which pages contain the evidence (use page numbers from context)
 
-Respond EXACTLY in the JSON format below:
-{{
-    "status": "PRESENT" or "ABSENT",
-    "evidence": "EXACT QUOTE from DOCUMENT CONTEXT only",
-    "confidence": 0.0 to 1.0,
-    "relevant_pages": [list of page numbers]
-}}
-"""
-    
-    response = llm.invoke(prompt)
+async def aevaluate_criterion_enhanced(
+    criterion: str,
+    context: str,
+    pages: list[int],
+    possible_answer: PossibleAnswer | None = None
+) -> CriterionResult:
+    """
+    Async version of evaluate_criterion_enhanced.
     
-    try:
-        clean_content = (response.content
-                         .strip()
-                         .replace("```json", "")
-                         .replace("```", "")
-                         .strip())
-        
-        data = json.loads(clean_content)
-        
-        result_pages = data.get("relevant_pages", pages)
-        result_pages = sorted(list(set(result_pages))) if result_pages else []
-        
-        return CriterionResult(
-            criterion=criterion,
-            status=data.get("status", "ABSENT"),
-            evidence=data.get("evidence", "Could not determine"),
-            confidence=float(data.get("confidence", 0.5)),
-            pages=result_pages
-        )
+    Args:
+        criterion: The criterion to evaluate
+        context: Retrieved document chunks
+        pages: Pages from document chunks
+        possible_answer: LLM-generated possible answer (optional)
         
-    except (json.JSONDecodeError, ValueError) as e:
-        return CriterionResult(
-            criterion=criterion,
-            status="ERROR",
-            evidence=f"Error processing LLM response: {str(e)[:100]}",
-            confidence=0.0,
-            pages=[]
-        )
+    Returns:
+        CriterionResult with status, evidence, confidence, pages
+    """
+    # Fall back to standard evaluation when no possible answer available
+    if possible_answer is None or not possible_answer.found:
+        return await aevaluate_criterion(criterion, context, pages)
+    
+    prompt = _build_enhanced_prompt(criterion, context, possible_answer)
+    
+    response = await llm.ainvoke(build_messages(AUDITOR_ENHANCED_SYSTEM_PROMPT, prompt))
+    record_usage(response)
+    
+    return _parse_result(criterion, response.content, pages)
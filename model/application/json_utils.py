@@ -0,0 +1,51 @@
+# json_utils.py - Parsing of JSON Returned by the LLM
+# ============================================================================
+
+import json
+import re
+
+import orjson
+
+# Markdown code fence around a JSON answer (```json ... ```)
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.MULTILINE | re.IGNORECASE)
+
+# First JSON object in a response with extra text around it
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def strip_code_fence(content: str) -> str:
+    """Removes markdown code fences around an LLM answer."""
+    stripped = content.strip()
+    if stripped.startswith("{"):
+        # Bare JSON, nothing to strip
+        return stripped
+    return _FENCE_RE.sub("", content).strip()
+
+
+def parse_llm_json(content: str) -> dict:
+    """
+    Parses the JSON object in an LLM response.
+    
+    Args:
+        content: Raw response content, optionally wrapped in a code fence
+    
+    Returns:
+        Parsed JSON object
+    
+    Raises:
+        json.JSONDecodeError: If no valid JSON object can be parsed
+    """
+    raw = strip_code_fence(content)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        pass
+    
+    match = _JSON_RE.search(raw)
+    if match:
+        raw = match.group(0)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than the stdlib parser (e.g. NaN, lone surrogates)
+        return json.loads(raw)
@@ -0,0 +1,114 @@
+# llm_cache.py - Content-Addressed Cache for LLM Responses
+# ============================================================================
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# Maximum number of responses kept in memory
+MAX_ENTRIES = 1024
+
+_memory_cache: OrderedDict[str, str] = OrderedDict()
+
+# Input tokens sent vs. served from the provider's prompt cache
+_usage = {"input_tokens": 0, "cached_tokens": 0}
+
+
+def _prompt_key(llm, prompt: str, system: str | None = None) -> str:
+    """
+    Hashes a request into a compact cache key.
+
+    The key covers the model and its output format, so the same prompt sent
+    to a plain-text and a JSON-constrained client is cached separately.
+    """
+    model = getattr(llm, "model", None) or getattr(llm, "model_name", "")
+    mime_type = getattr(llm, "response_mime_type", None) or ""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{model}\x00{mime_type}\x00".encode())
+    if system:
+        h.update(system.encode())
+        h.update(b"\x00")
+    h.update(prompt.encode())
+    return h.hexdigest()
+
+
+def build_messages(system: str, prompt: str) -> list:
+    """
+    Splits a request into static instructions and the per-call content.
+
+    Keeping the system block byte-identical across calls lets the provider
+    serve it from its prompt cache.
+
+    Args:
+        system: Static instructions shared by every call
+        prompt: Dynamic content (criterion, context, hints)
+
+    Returns:
+        Chat messages for the LLM
+    """
+    return [SystemMessage(content=system), HumanMessage(content=prompt)]
+
+
+def record_usage(response) -> None:
+    """Accumulates input and prompt-cache token counts from a response."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    _usage["input_tokens"] += usage.get("input_tokens", 0)
+    _usage["cached_tokens"] += (usage.get("input_token_details") or {}).get("cache_read", 0)
+
+
+def prompt_cache_stats() -> dict[str, int]:
+    """Returns input tokens sent and served from the provider's prompt cache."""
+    return dict(_usage)
+
+
+def _remember(key: str, content: str) -> None:
+    """Stores a response in memory, evicting the least recently used entry."""
+    _memory_cache[key] = content
+    _memory_cache.move_to_end(key)
+    if len(_memory_cache) > MAX_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+
+async def cached_ainvoke(
+    llm,
+    prompt: str,
+    system: str | None = None,
+    parse: Callable[[str], Any] | None = None
+) -> Any:
+    """
+    Invokes the LLM asynchronously, reusing the response of identical prompts.
+
+    When parse is given, a response is cached only if it parses, so a
+    malformed answer is requested again next time instead of being replayed.
+
+    Args:
+        llm: LangChain chat model exposing ainvoke
+        prompt: Prompt text
+        system: Optional static system instructions sent ahead of the prompt
+        parse: Optional function turning the response content into a result;
+            its exceptions propagate to the caller
+
+    Returns:
+        Parsed response if parse is given, otherwise the raw response content
+    """
+    key = _prompt_key(llm, prompt, system)
+
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        content = _memory_cache[key]
+        return parse(content) if parse else content
+
+    response = await llm.ainvoke(build_messages(system, prompt) if system else prompt)
+    record_usage(response)
+    content = response.content
+
+    result = parse(content) if parse else content
+    _remember(key, content)
+    return result
+
+
+def clear_llm_cache() -> None:
+    """Removes all cached responses."""
+    _memory_cache.clear()
@@ -19,16 +19,6 @@ from rich.console import Console
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from auditor import run_audit
-from output import (
-    display_banner,
-    display_table,
-    display_json,
-    save_json,
-    save_table_txt,
-    display_conclusion
-)
-
 console = Console()
 
 
@@ -43,6 +33,18 @@ async def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing: these connect to Milvus and load the
+    # embedding model, which --help and invalid arguments should not pay for
+    from auditor import run_audit
+    from output import (
+        display_banner,
+        display_table,
+        display_json,
+        save_json,
+        save_table_txt,
+        display_conclusion
+    )
+    
     display_banner()
     
     # If document provided via CLI
@@ -73,10 +75,7 @@ async def main():
             milvus_uri=config.milvus.uri,
             collection_name=config.milvus.collection_name,
             output_dir=config.output.directory,
-            audit_criteria=[
-                {"query": c.query, "confidence": c.confidence}
-                for c in config.audit_criteria
-            ]
+            audit_criteria=config.audit_criteria
         )
         
         if not config.documents:
@@ -98,13 +97,12 @@ async def main():
             display_table(report)
             
             # Save outputs with document-specific names
+            base = f"audit_{doc.stem}"
             if config.output.save_json:
-                filename = f"audit_{doc.filename.replace('.pdf', '')}.json"
-                save_json(report, filename)
+                save_json(report, base + ".json")
             
             if config.output.save_txt:
-                filename = f"audit_{doc.filename.replace('.pdf', '')}.txt"
-                save_table_txt(report, filename)
+                save_table_txt(report, base + ".txt")
         
         display_conclusion()
         
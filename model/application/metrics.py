@@ -7,6 +7,8 @@ from typing import Dict, List
 from rich.console import Console
 from rich.table import Table
 
+from .llm_cache import prompt_cache_stats
+
 console = Console()
 
 
@@ -33,9 +35,17 @@ class AuditMetrics:
         table.add_column("Metric", style="cyan")
         table.add_column("Value", style="green")
         
-        avg_time = sum(self.time_per_criterion.values()) / len(self.time_per_criterion) if self.time_per_criterion else 0
-        avg_attempts = sum(self.attempts_per_criterion.values()) / len(self.attempts_per_criterion) if self.attempts_per_criterion else 0
-        avg_confidence = sum(self.confidence_per_criterion.values()) / len(self.confidence_per_criterion) if self.confidence_per_criterion else 0
+        # Single pass over the criteria for all three averages
+        total_time = total_attempts = total_confidence = 0.0
+        for criterion, time_spent in self.time_per_criterion.items():
+            total_time += time_spent
+            total_attempts += self.attempts_per_criterion[criterion]
+            total_confidence += self.confidence_per_criterion[criterion]
+        
+        n = len(self.time_per_criterion) or 1
+        avg_time = total_time / n
+        avg_attempts = total_attempts / n
+        avg_confidence = total_confidence / n
         
         table.add_row("Total Criteria", str(self.total_criteria))
         table.add_row("Total Time", f"{self.total_time:.2f}s")
@@ -43,6 +53,13 @@ class AuditMetrics:
         table.add_row("Avg Attempts", f"{avg_attempts:.1f}")
         table.add_row("Avg Confidence", f"{avg_confidence:.0%}")
         
+        usage = prompt_cache_stats()
+        if usage["input_tokens"]:
+            table.add_row(
+                "Prompt Cache Hits",
+                f"{usage['cached_tokens']}/{usage['input_tokens']} input tokens"
+            )
+        
         console.print(table)
 
 
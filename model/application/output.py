@@ -1,7 +1,10 @@
 # output.py - Display and Export Functions
 # ============================================================================
 
+import bisect
 from pathlib import Path
+
+import orjson
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -11,6 +14,23 @@ from .config import OUTPUT_DIR
 
 console = Console()
 
+# Status markup and confidence colors (< 0.5, < 0.8, >= 0.8) for display_table
+_STATUS_FMT = {
+    "PRESENT": "[green]✓ PRESENT[/green]",
+    "ABSENT": "[red]✗ ABSENT[/red]",
+}
+_ERROR_FMT = "[yellow]⚠ ERROR[/yellow]"
+_CONF_THRESHOLDS = (0.5, 0.8)
+_CONF_COLORS = ("red", "yellow", "green")
+
+# File buffer for report writes (64 KiB)
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def _truncate(text: str, max_len: int) -> str:
+    """Shortens text to max_len characters, ending in "..." when cut."""
+    return text if len(text) <= max_len else text[:max_len - 3] + "..."
+
 
 def display_banner() -> None:
     """Displays the system's initial banner."""
@@ -49,48 +69,33 @@ def display_table(report: AuditReport) -> None:
     table.add_column("Pages", justify="center", width=8)
     table.add_column("Conf.", justify="center", width=6)
     
+    add_row = table.add_row
     for i, result in enumerate(report.results, 1):
+        confidence = result.confidence
+        pages = result.pages
         
-        # Format status
-        if result.status == "PRESENT":
-            status_fmt = "[green]✓ PRESENT[/green]"
-        elif result.status == "ABSENT":
-            status_fmt = "[red]✗ ABSENT[/red]"
-        else:
-            status_fmt = "[yellow]⚠ ERROR[/yellow]"
-        
-        # Confidence color
-        if result.confidence >= 0.8:
-            conf_color = "green"
-        elif result.confidence >= 0.5:
-            conf_color = "yellow"
-        else:
-            conf_color = "red"
+        status_fmt = _STATUS_FMT.get(result.status, _ERROR_FMT)
+        conf_color = _CONF_COLORS[bisect.bisect_right(_CONF_THRESHOLDS, confidence)]
         
         # Truncate texts
-        criterion_fmt = (result.criterion[:37] + "..." 
-                        if len(result.criterion) > 40 
-                        else result.criterion)
-        
-        evidence_fmt = (result.evidence[:42] + "..." 
-                       if len(result.evidence) > 45 
-                       else result.evidence)
+        criterion_fmt = _truncate(result.criterion, 40)
+        evidence_fmt = _truncate(result.evidence, 45)
         
         # Format pages
-        if result.pages:
-            pages_fmt = ", ".join(str(p) for p in result.pages[:3])
-            if len(result.pages) > 3:
+        if pages:
+            pages_fmt = ", ".join(str(p) for p in pages[:3])
+            if len(pages) > 3:
                 pages_fmt += "..."
         else:
             pages_fmt = "-"
         
-        table.add_row(
+        add_row(
             str(i),
             status_fmt,
             criterion_fmt,
             evidence_fmt,
             f"[cyan]{pages_fmt}[/cyan]",
-            f"[{conf_color}]{result.confidence:.0%}[/{conf_color}]"
+            f"[{conf_color}]{confidence:.0%}[/{conf_color}]"
         )
     
     console.print(table)
@@ -99,7 +104,7 @@ def display_table(report: AuditReport) -> None:
 def display_json(report: AuditReport) -> None:
     """Displays the report in JSON format."""
     console.print("\n[bold yellow]📄 JSON Output:[/bold yellow]")
-    console.print_json(report.model_dump_json())
+    console.print_json(orjson.dumps(report.model_dump(mode="json")).decode())
 
 
 def save_json(report: AuditReport, filename: str = "audit_report.json") -> Path:
@@ -115,8 +120,9 @@ def save_json(report: AuditReport, filename: str = "audit_report.json") -> Path:
     """
     output_path = OUTPUT_DIR / filename
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(report.model_dump_json(indent=2))
+    # orjson serializes straight to UTF-8 bytes
+    with open(output_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(orjson.dumps(report.model_dump(mode="json"), option=orjson.OPT_INDENT_2))
     
     console.print(f"\n[green]✓ Report saved to:[/green] {output_path}")
     return output_path
@@ -135,7 +141,7 @@ def save_table_txt(report: AuditReport, filename: str = "audit_report.txt") -> P
     """
     output_path = OUTPUT_DIR / filename
     
-    lines = [
+    header = (
         "=" * 70,
         "AUDIT REPORT",
         "=" * 70,
@@ -148,19 +154,20 @@ def save_table_txt(report: AuditReport, filename: str = "audit_report.txt") -> P
         "-" * 70,
         "DETAILED RESULTS",
         "-" * 70,
-    ]
-    
-    for i, result in enumerate(report.results, 1):
-        lines.append(f"\n{i}. {result.criterion}")
-        lines.append(f"   Status: {result.status}")
-        lines.append(f"   Confidence: {result.confidence:.0%}")
-        lines.append(f"   Pages: {', '.join(map(str, result.pages)) if result.pages else 'N/A'}")
-        lines.append(f"   Evidence: {result.evidence[:100]}{'...' if len(result.evidence) > 100 else ''}")
-    
-    lines.append("\n" + "=" * 70)
+    )
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        for line in header:
+            f.write(line + "\n")
+        
+        for i, result in enumerate(report.results, 1):
+            f.write(f"\n{i}. {result.criterion}\n")
+            f.write(f"   Status: {result.status}\n")
+            f.write(f"   Confidence: {result.confidence:.0%}\n")
+            f.write(f"   Pages: {', '.join(map(str, result.pages)) if result.pages else 'N/A'}\n")
+            f.write(f"   Evidence: {result.evidence[:100]}{'...' if len(result.evidence) > 100 else ''}\n")
+        
+        f.write("\n" + "=" * 70 + "\n")
     
     console.print(f"[green]✓ Text report saved to:[/green] {output_path}")
     return output_path
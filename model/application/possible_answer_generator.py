@@ -2,15 +2,94 @@
 # ============================================================================
 
 import asyncio
-import json
-from typing import Optional
+import hashlib
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
 
+import orjson
 from rich.console import Console
 
+from .json_utils import parse_llm_json, strip_code_fence
+from .llm_cache import record_usage
 from .possible_answer_models import PossibleAnswer, RawPDFContent
+from .raw_extractor import format_pages
 
 console = Console()
 
+# Generated answers keyed by (criterion, filename, document size), with the
+# time they were stored; shared by all generators in the process
+_ANSWER_CACHE: OrderedDict[str, tuple[float, PossibleAnswer]] = OrderedDict()
+
+# Prompt for answering one criterion ({criterion}, {pdf}); literal braces are doubled
+_PROMPT_TEMPLATE = """You are an expert document analyst. Your task is to find information in a document that answers a specific audit criterion.
+
+AUDIT CRITERION TO FIND:
+{criterion}
+
+DOCUMENT CONTENT:
+{pdf}
+
+INSTRUCTIONS:
+1. Carefully read the entire document content
+2. Find any information that directly or indirectly answers the criterion
+3. If you find relevant information, extract the key points and note which pages contain the evidence
+4. If no relevant information is found, indicate that clearly
+
+Respond ONLY in valid JSON format (no markdown, no additional text):
+
+{{
+    "found": true or false,
+    "answer": "A concise summary of the relevant information found, or empty string if not found",
+    "relevant_pages": [list of page numbers where the information was found, or empty list],
+    "confidence": number from 0.0 to 1.0, how sure you are that the information is or is not in the document,
+    "reasoning": "One sentence explaining why the information was or was not found"
+}}
+
+CRITICAL RULES:
+- Set "found" to true ONLY if you find information that actually addresses the criterion
+- The "answer" should summarize what you found, not quote the entire text
+- Include ALL page numbers where relevant information appears
+- If nothing relevant is found, set "found" to false and "answer" to empty string
+"""
+
+# Prompt for answering several numbered criteria at once ({numbered}, {pdf})
+_BATCH_PROMPT_TEMPLATE = """You are an expert document analyst. Your task is to find information in a document that answers each of several audit criteria.
+
+DOCUMENT CONTENT:
+{pdf}
+
+AUDIT CRITERIA TO FIND:
+{numbered}
+
+INSTRUCTIONS:
+1. Carefully read the entire document content
+2. For each criterion, find any information that directly or indirectly answers it
+3. If you find relevant information, extract the key points and note which pages contain the evidence
+4. If no relevant information is found for a criterion, indicate that clearly
+
+Respond ONLY in valid JSON format (no markdown, no additional text), with one entry per criterion:
+
+{{
+    "results": [
+        {{
+            "index": criterion number,
+            "found": true or false,
+            "answer": "A concise summary of the relevant information found, or empty string if not found",
+            "relevant_pages": [list of page numbers where the information was found, or empty list],
+            "confidence": number from 0.0 to 1.0, how sure you are that the information is or is not in the document,
+            "reasoning": "One sentence explaining why the information was or was not found"
+        }}
+    ]
+}}
+
+CRITICAL RULES:
+- Set "found" to true ONLY if you find information that actually addresses the criterion
+- The "answer" should summarize what you found, not quote the entire text
+- Include ALL page numbers where relevant information appears
+- If nothing relevant is found, set "found" to false and "answer" to empty string
+"""
+
 
 def _get_default_llm():
     """Lazy load the default LLM to avoid import-time Milvus connection."""
@@ -25,6 +104,14 @@ class PossibleAnswerGenerator:
     MAX_RETRIES = 3
     # Base delay for exponential backoff (seconds)
     BASE_DELAY = 1.0
+    # Criteria answered per batched LLM call
+    BATCH_SIZE = 8
+    # Maximum batched LLM calls in flight
+    MAX_CONCURRENCY = 4
+    # Maximum number of cached answers
+    CACHE_MAX_ENTRIES = 512
+    # Seconds a cached answer stays valid
+    CACHE_TTL = 24 * 60 * 60
     
     def __init__(self, llm_client=None):
         """
@@ -50,6 +137,11 @@ class PossibleAnswerGenerator:
         Returns:
             PossibleAnswer with answer text and relevant pages
         """
+        key = self._cache_key(criterion, pdf_content)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
         # Format PDF content for the prompt
         formatted_content = self._format_pdf_content(pdf_content)
         
@@ -61,7 +153,10 @@ class PossibleAnswerGenerator:
         for attempt in range(self.MAX_RETRIES):
             try:
                 response = await self._invoke_llm(prompt)
-                return self._parse_response(criterion, response)
+                answer = self._parse_response(criterion, response)
+                if not answer.error:
+                    self._store_cached(key, answer)
+                return answer
             except Exception as e:
                 last_error = e
                 if attempt < self.MAX_RETRIES - 1:
@@ -77,12 +172,69 @@ class PossibleAnswerGenerator:
             f"[red]Failed to generate answer for criterion after {self.MAX_RETRIES} attempts: "
             f"{str(last_error)[:100]}[/red]"
         )
-        return PossibleAnswer(
-            criterion=criterion,
-            answer="",
-            relevant_pages=[],
-            found=False
-        )
+        return self._failed_answer(criterion)
+    
+    async def iter_answers(
+        self,
+        criteria: list[str],
+        pdf_content: RawPDFContent
+    ) -> AsyncIterator[tuple[str, PossibleAnswer]]:
+        """
+        Generates possible answers for multiple criteria as they complete.
+        
+        Criteria are answered in groups of BATCH_SIZE, each group with a
+        single LLM call that carries the document once; at most
+        MAX_CONCURRENCY group calls run at the same time. Cached answers are
+        yielded first, then each group as soon as its call finishes, so a
+        group stuck in retries does not hold back the others.
+        
+        Args:
+            criteria: List of audit criteria
+            pdf_content: Full PDF text content
+            
+        Yields:
+            (criterion, PossibleAnswer) pairs in completion order
+        """
+        pending = []
+        for criterion in dict.fromkeys(criteria):
+            cached = self._get_cached(self._cache_key(criterion, pdf_content))
+            if cached is not None:
+                yield criterion, cached
+            else:
+                pending.append(criterion)
+        
+        if not pending:
+            return
+        
+        sem = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        
+        async def _run_group(group: list[str]) -> tuple[list[str], dict | Exception]:
+            async with sem:
+                try:
+                    return group, await self._generate_group(group, pdf_content)
+                except Exception as e:
+                    return group, e
+        
+        tasks = [
+            asyncio.create_task(_run_group(pending[i:i + self.BATCH_SIZE]))
+            for i in range(0, len(pending), self.BATCH_SIZE)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                group, result = await next_done
+                if isinstance(result, Exception):
+                    console.print(
+                        f"[red]Error generating answers for {len(group)} criteria: {str(result)[:100]}[/red]"
+                    )
+                    for criterion in group:
+                        yield criterion, self._failed_answer(criterion)
+                else:
+                    for item in result.items():
+                        yield item
+        finally:
+            # Consumer stopped early: do not leave LLM calls running
+            for task in tasks:
+                task.cancel()
     
     async def generate_answers_batch(
         self, 
@@ -90,7 +242,7 @@ class PossibleAnswerGenerator:
         pdf_content: RawPDFContent
     ) -> dict[str, PossibleAnswer]:
         """
-        Generates possible answers for multiple criteria concurrently.
+        Generates possible answers for multiple criteria.
         
         Args:
             criteria: List of audit criteria
@@ -99,127 +251,173 @@ class PossibleAnswerGenerator:
         Returns:
             Dict mapping criterion to PossibleAnswer
         """
-        if not criteria:
-            return {}
+        return {
+            criterion: answer
+            async for criterion, answer in self.iter_answers(criteria, pdf_content)
+        }
+    
+    async def _generate_group(
+        self,
+        criteria: list[str],
+        pdf_content: RawPDFContent
+    ) -> dict[str, PossibleAnswer]:
+        """
+        Answers a group of criteria with one LLM call.
         
-        # Create tasks for concurrent processing
-        tasks = [
-            self.generate_answer(criterion, pdf_content)
-            for criterion in criteria
-        ]
+        Falls back to one call per criterion, each with its own retries, if
+        the batched call fails or its response cannot be parsed or does not
+        cover every criterion.
+        """
+        if len(criteria) == 1:
+            return {criteria[0]: await self.generate_answer(criteria[0], pdf_content)}
         
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Build result dictionary
-        answers: dict[str, PossibleAnswer] = {}
-        
-        for criterion, result in zip(criteria, results):
-            if isinstance(result, Exception):
-                console.print(
-                    f"[red]Error generating answer for '{criterion[:50]}...': {str(result)[:100]}[/red]"
-                )
-                answers[criterion] = PossibleAnswer(
-                    criterion=criterion,
-                    answer="",
-                    relevant_pages=[],
-                    found=False
-                )
-            else:
-                answers[criterion] = result
+        prompt = self._build_batch_prompt(criteria, self._format_pdf_content(pdf_content))
+        
+        try:
+            data = parse_llm_json(await self._invoke_llm(prompt))
+            by_index = {int(item["index"]): item for item in data["results"]}
+            answers = {
+                criterion: self._answer_from_data(criterion, by_index[i])
+                for i, criterion in enumerate(criteria)
+            }
+        except Exception as e:
+            console.print(
+                f"[yellow]Batched answer generation failed, answering one by one: {str(e)[:100]}[/yellow]"
+            )
+            results = await asyncio.gather(
+                *(self.generate_answer(c, pdf_content) for c in criteria)
+            )
+            return dict(zip(criteria, results))
         
+        for criterion, answer in answers.items():
+            self._store_cached(self._cache_key(criterion, pdf_content), answer)
         return answers
     
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Removes all cached answers."""
+        _ANSWER_CACHE.clear()
+    
+    def _cache_key(self, criterion: str, pdf_content: RawPDFContent) -> str:
+        """
+        Builds the cache key of a criterion for a given document.
+        
+        The document is identified by a digest of the text sent to the LLM,
+        so a revised file with the same name and length gets fresh answers.
+        """
+        if pdf_content._digest is None:
+            content = self._format_pdf_content(pdf_content).encode()
+            pdf_content._digest = hashlib.sha256(content).hexdigest()
+        raw = f"{criterion}|{pdf_content._digest}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _get_cached(self, key: str) -> PossibleAnswer | None:
+        """Returns a cached answer if present and not expired."""
+        entry = _ANSWER_CACHE.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, answer = entry
+        if time.monotonic() - stored_at > self.CACHE_TTL:
+            del _ANSWER_CACHE[key]
+            return None
+        
+        _ANSWER_CACHE.move_to_end(key)
+        return answer
+    
+    def _store_cached(self, key: str, answer: PossibleAnswer) -> None:
+        """Caches an answer, evicting the least recently used entry."""
+        _ANSWER_CACHE[key] = (time.monotonic(), answer)
+        _ANSWER_CACHE.move_to_end(key)
+        if len(_ANSWER_CACHE) > self.CACHE_MAX_ENTRIES:
+            _ANSWER_CACHE.popitem(last=False)
+    
     def _format_pdf_content(self, pdf_content: RawPDFContent) -> str:
-        """Format PDF content for the LLM prompt."""
+        """Format PDF content for the LLM prompt, once per document."""
         if not pdf_content.pages:
             return "[No content available]"
         
-        formatted_parts = []
-        for page_num, text in pdf_content.pages:
-            formatted_parts.append(f"[Page {page_num}]\n{text}")
+        if pdf_content._formatted is None:
+            pdf_content._formatted = format_pages(pdf_content.pages)
         
-        return "\n\n".join(formatted_parts)
+        return pdf_content._formatted
     
     def _build_prompt(self, criterion: str, pdf_content: str) -> str:
         """Build the LLM prompt for generating a possible answer."""
-        return f"""You are an expert document analyst. Your task is to find information in a document that answers a specific audit criterion.
-
-AUDIT CRITERION TO FIND:
-{criterion}
-
-DOCUMENT CONTENT:
-{pdf_content}
-
-INSTRUCTIONS:
-1. Carefully read the entire document content
-2. Find any information that directly or indirectly answers the criterion
-3. If you find relevant information, extract the key points and note which pages contain the evidence
-4. If no relevant information is found, indicate that clearly
-
-Respond ONLY in valid JSON format (no markdown, no additional text):
-
-{{
-    "found": true or false,
-    "answer": "A concise summary of the relevant information found, or empty string if not found",
-    "relevant_pages": [list of page numbers where the information was found, or empty list]
-}}
-
-CRITICAL RULES:
-- Set "found" to true ONLY if you find information that actually addresses the criterion
-- The "answer" should summarize what you found, not quote the entire text
-- Include ALL page numbers where relevant information appears
-- If nothing relevant is found, set "found" to false and "answer" to empty string
-"""
+        return _PROMPT_TEMPLATE.format(criterion=criterion, pdf=pdf_content)
+    
+    def _build_batch_prompt(self, criteria: list[str], pdf_content: str) -> str:
+        """Build the LLM prompt answering several criteria at once."""
+        numbered = "\n".join(f"[{i}] {c}" for i, c in enumerate(criteria))
+        return _BATCH_PROMPT_TEMPLATE.format(numbered=numbered, pdf=pdf_content)
     
     async def _invoke_llm(self, prompt: str) -> str:
         """
         Invoke the LLM asynchronously.
         
-        The spelling library's Chat.invoke() is synchronous, so we run it
-        in a thread pool to avoid blocking the event loop.
+        Uses the client's native ainvoke() when available, so calls share
+        the model's own connection pool without a thread hop. Clients that
+        only expose a synchronous invoke() run in a worker thread to avoid
+        blocking the event loop.
         """
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self.llm.invoke, prompt)
+        if hasattr(self.llm, "ainvoke"):
+            response = await self.llm.ainvoke(prompt)
+        else:
+            response = await asyncio.to_thread(self.llm.invoke, prompt)
+        record_usage(response)
         return response.content
     
+    def _answer_from_data(self, criterion: str, data: dict) -> PossibleAnswer:
+        """Convert one parsed JSON answer into a PossibleAnswer."""
+        found = data.get("found", False)
+        answer = data.get("answer", "")
+        relevant_pages = data.get("relevant_pages", [])
+        confidence = min(max(float(data.get("confidence", 0.5)), 0.0), 1.0)
+        
+        # Ensure relevant_pages is a sorted list of unique integers
+        if relevant_pages:
+            relevant_pages = self._normalize_pages(relevant_pages)
+        
+        return PossibleAnswer(
+            criterion=criterion,
+            answer=answer if found else "",
+            relevant_pages=relevant_pages if found else [],
+            found=bool(found),
+            confidence=confidence,
+            reasoning=str(data.get("reasoning", ""))
+        )
+    
+    @staticmethod
+    def _normalize_pages(pages: list) -> list[int]:
+        """Converts pages to unique ints in ascending order."""
+        ints = [int(p) for p in pages]
+        # LLMs usually list pages in document order; only sort when they don't
+        if any(a > b for a, b in zip(ints, ints[1:])):
+            ints.sort()
+        
+        # Drop pages listed more than once (equal pages are now adjacent)
+        unique = ints[:1]
+        for page in ints[1:]:
+            if page != unique[-1]:
+                unique.append(page)
+        return unique
+    
+    @staticmethod
+    def _failed_answer(criterion: str) -> PossibleAnswer:
+        """Builds the answer of a criterion whose generation failed."""
+        return PossibleAnswer(criterion=criterion, error=True)
+    
     def _parse_response(self, criterion: str, response: str) -> PossibleAnswer:
         """Parse the LLM response into a PossibleAnswer."""
         try:
             # Clean up response (remove markdown code blocks if present)
-            clean_content = (
-                response
-                .strip()
-                .replace("```json", "")
-                .replace("```", "")
-                .strip()
-            )
-            
-            data = json.loads(clean_content)
+            data = orjson.loads(strip_code_fence(response))
             
-            found = data.get("found", False)
-            answer = data.get("answer", "")
-            relevant_pages = data.get("relevant_pages", [])
+            return self._answer_from_data(criterion, data)
             
-            # Ensure relevant_pages is a list of integers
-            if relevant_pages:
-                relevant_pages = sorted([int(p) for p in relevant_pages])
-            
-            return PossibleAnswer(
-                criterion=criterion,
-                answer=answer if found else "",
-                relevant_pages=relevant_pages if found else [],
-                found=bool(found)
-            )
-            
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
+        except (orjson.JSONDecodeError, ValueError, TypeError) as e:
             console.print(
                 f"[yellow]Failed to parse LLM response for criterion: {str(e)[:100]}[/yellow]"
             )
-            # Return empty answer on parse failure
-            return PossibleAnswer(
-                criterion=criterion,
-                answer="",
-                relevant_pages=[],
-                found=False
-            )
+            # Return an empty, failed answer on parse failure
+            return self._failed_answer(criterion)
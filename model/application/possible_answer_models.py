@@ -1,7 +1,7 @@
 # possible_answer_models.py - Pydantic Models for Possible Answer Feature
 # ============================================================================
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class RawPDFContent(BaseModel):
@@ -13,6 +13,11 @@ class RawPDFContent(BaseModel):
     )
     total_pages: int = Field(default=0, description="Total number of pages")
     total_characters: int = Field(default=0, description="Total character count")
+    
+    # Prompt-ready text, built once by PossibleAnswerGenerator
+    _formatted: str | None = PrivateAttr(default=None)
+    # Digest of the prompt-ready text, used to key cached answers
+    _digest: str | None = PrivateAttr(default=None)
 
 
 class TextSegment(BaseModel):
@@ -32,6 +37,17 @@ class PossibleAnswer(BaseModel):
         description="Pages where info was found"
     )
     found: bool = Field(default=False, description="Whether relevant information was found")
+    confidence: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="How sure the analysis is of its found/not found verdict (0-1)"
+    )
+    reasoning: str = Field(default="", description="Why the information was or was not found")
+    error: bool = Field(
+        default=False,
+        description="Whether generation failed (found is then meaningless)"
+    )
 
 
 class PossibleAnswerConfig(BaseModel):
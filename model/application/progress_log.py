@@ -0,0 +1,64 @@
+# progress_log.py - Buffered Progress Output for Concurrent Audits
+# ============================================================================
+
+import asyncio
+import contextlib
+
+from rich.console import Console
+
+console = Console()
+
+_queue: asyncio.Queue[str] | None = None
+_depth = 0
+
+
+def log(message: str) -> None:
+    """
+    Prints a progress message without blocking the caller.
+
+    Inside buffered_console() the message is queued and rendered by a
+    single background task; otherwise it is printed immediately.
+
+    Args:
+        message: Rich markup message
+    """
+    if _queue is not None:
+        _queue.put_nowait(message)
+    else:
+        console.print(message)
+
+
+async def _drain(queue: asyncio.Queue[str]) -> None:
+    """Renders queued messages until cancelled."""
+    while True:
+        console.print(await queue.get())
+
+
+@contextlib.asynccontextmanager
+async def buffered_console():
+    """Routes log() calls through a queue drained by a background task."""
+    global _queue, _depth
+
+    _depth += 1
+    if _depth > 1:
+        # Already buffering (e.g. concurrent audits) - share the same queue
+        try:
+            yield
+        finally:
+            _depth -= 1
+        return
+
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    _queue = queue
+    task = asyncio.create_task(_drain(queue))
+    try:
+        yield
+    finally:
+        _depth -= 1
+        _queue = None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        # Flush whatever the drain task did not get to
+        while not queue.empty():
+            console.print(queue.get_nowait())
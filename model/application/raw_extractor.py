@@ -1,7 +1,11 @@
 # raw_extractor.py - Raw PDF Text Extraction for Possible Answer Generation
 # ============================================================================
 
+import mmap
 import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 from rich.console import Console
 
 from .possible_answer_models import RawPDFContent, TextSegment
@@ -15,6 +19,37 @@ except ImportError:
 
 console = Console()
 
+# Page layout used when joining pages: "[Page N]\n<text>", blank line between pages
+PAGE_MARKER_OPEN = "[Page "
+PAGE_MARKER_CLOSE = "]\n"
+PAGE_SEPARATOR = "\n\n"
+# Characters a page adds besides its text and page-number digits
+PAGE_OVERHEAD = len(PAGE_MARKER_OPEN) + len(PAGE_MARKER_CLOSE) + len(PAGE_SEPARATOR)
+
+
+def format_pages(pages: list[tuple[int, str]]) -> str:
+    """
+    Joins pages into a single text with a "[Page N]" marker before each one.
+    
+    Args:
+        pages: (page number, text) tuples
+        
+    Returns:
+        Pages separated by blank lines
+    """
+    # Joining the fragments directly avoids copying every page's text into
+    # an intermediate per-page string
+    parts: list[str] = []
+    append = parts.append
+    opener = PAGE_MARKER_OPEN
+    for page_num, text in pages:
+        append(opener)
+        append(str(page_num))
+        append(PAGE_MARKER_CLOSE)
+        append(text)
+        opener = PAGE_SEPARATOR + PAGE_MARKER_OPEN
+    return "".join(parts)
+
 
 class PDFExtractionError(Exception):
     """Raised when PDF extraction fails."""
@@ -26,6 +61,12 @@ class RawPDFExtractor:
     
     # Approximate characters per token (conservative estimate)
     CHARS_PER_TOKEN = 4
+    # Pages with less text than this (e.g. scanned images, page numbers) are skipped
+    MIN_PAGE_CHARS = 10
+    # PDFs with fewer pages per worker than this are extracted sequentially
+    PARALLEL_MIN_PAGES = 4
+    # Maximum extraction threads
+    MAX_WORKERS = os.cpu_count() or 1
     
     def extract_full_text(self, pdf_path: str) -> RawPDFContent:
         """
@@ -47,10 +88,7 @@ class RawPDFExtractor:
         filename = os.path.basename(pdf_path)
         
         try:
-            if PDF_EXTRACTOR == "pdfplumber":
-                pages = self._extract_with_pdfplumber(pdf_path)
-            else:
-                pages = self._extract_with_pypdf2(pdf_path)
+            pages = self._extract_pages(pdf_path)
         except Exception as e:
             raise PDFExtractionError(f"Failed to extract text from {filename}: {str(e)}")
         
@@ -63,31 +101,69 @@ class RawPDFExtractor:
             total_characters=total_characters
         )
     
-    def _extract_with_pdfplumber(self, pdf_path: str) -> list[tuple[int, str]]:
-        """Extract text using pdfplumber (better quality)."""
+    def _extract_pages(self, pdf_path: str) -> list[tuple[int, str]]:
+        """
+        Extracts page texts, splitting larger PDFs across worker threads.
+        
+        Each worker opens its own handle on a contiguous page range, since
+        the parsers keep per-document stream state that is not thread-safe.
+        """
+        extract_range = (
+            self._extract_with_pdfplumber if PDF_EXTRACTOR == "pdfplumber"
+            else self._extract_with_pypdf2
+        )
+        
+        total = self._count_pages(pdf_path)
+        workers = min(self.MAX_WORKERS, total // self.PARALLEL_MIN_PAGES)
+        if workers <= 1:
+            return extract_range(pdf_path, 0, total)
+        
+        step = -(-total // workers)
+        ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parts = executor.map(lambda r: extract_range(pdf_path, *r), ranges)
+            return [page for part in parts for page in part]
+    
+    def _count_pages(self, pdf_path: str) -> int:
+        """Returns the number of pages in the PDF."""
+        with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if PDF_EXTRACTOR == "pdfplumber":
+                with pdfplumber.open(mm) as pdf:
+                    return len(pdf.pages)
+            return len(PyPDF2.PdfReader(mm).pages)
+    
+    def _extract_with_pdfplumber(self, pdf_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+        """Extract text of pages [start, stop) using pdfplumber (better quality)."""
         pages = []
         
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages, 1):
-                text = page.extract_text()
-                if text and text.strip():
-                    pages.append((i, text))
+        # Memory-map the file so the OS only pages in what the parser reads
+        with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with pdfplumber.open(mm) as pdf:
+                for i in range(start, stop):
+                    text = pdf.pages[i].extract_text()
+                    if self._has_text(text):
+                        pages.append((i + 1, text))
         
         return pages
     
-    def _extract_with_pypdf2(self, pdf_path: str) -> list[tuple[int, str]]:
-        """Extract text using PyPDF2 (fallback)."""
+    def _extract_with_pypdf2(self, pdf_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+        """Extract text of pages [start, stop) using PyPDF2 (fallback)."""
         pages = []
         
-        with open(pdf_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for i, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text and text.strip():
-                    pages.append((i, text))
+        with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            reader = PyPDF2.PdfReader(mm)
+            for i in range(start, stop):
+                text = reader.pages[i].extract_text()
+                if self._has_text(text):
+                    pages.append((i + 1, text))
         
         return pages
     
+    def _has_text(self, text: str | None) -> bool:
+        """Checks if a page carries enough text to be worth keeping."""
+        return bool(text) and len(text.strip()) >= self.MIN_PAGE_CHARS
+    
     def get_text_for_llm(
         self, 
         content: RawPDFContent, 
@@ -127,10 +203,7 @@ class RawPDFExtractor:
     
     def _format_pages_as_text(self, pages: list[tuple[int, str]]) -> str:
         """Format pages into a single text with page markers."""
-        formatted_parts = []
-        for page_num, text in pages:
-            formatted_parts.append(f"[Page {page_num}]\n{text}")
-        return "\n\n".join(formatted_parts)
+        return format_pages(pages)
     
     def _split_into_segments(
         self, 
@@ -138,27 +211,19 @@ class RawPDFExtractor:
         max_chars: int
     ) -> list[TextSegment]:
         """Split pages into segments that fit within max_chars."""
-        segments = []
-        current_pages: list[tuple[int, str]] = []
-        current_chars = 0
+        # Formatted size of each page: marker + text + separator
+        prefix = list(accumulate(
+            len(text) + len(str(page_num)) + PAGE_OVERHEAD for page_num, text in pages
+        ))
         
-        for page_num, text in pages:
-            page_chars = len(text) + len(f"[Page {page_num}]\n") + 2  # +2 for \n\n
-            
-            # If adding this page exceeds limit, finalize current segment
-            if current_chars + page_chars > max_chars and current_pages:
-                segment = self._create_segment(current_pages)
-                segments.append(segment)
-                current_pages = []
-                current_chars = 0
-            
-            current_pages.append((page_num, text))
-            current_chars += page_chars
-        
-        # Add remaining pages as final segment
-        if current_pages:
-            segment = self._create_segment(current_pages)
-            segments.append(segment)
+        segments = []
+        start = 0
+        while start < len(pages):
+            offset = prefix[start - 1] if start else 0
+            # An oversized page still forms its own segment
+            end = max(bisect_right(prefix, offset + max_chars), start + 1)
+            segments.append(self._create_segment(pages[start:end]))
+            start = end
         
         return segments
     
@@ -1,19 +1,86 @@
 # retriever.py - Hybrid Semantic Search Functions in Milvus
 # ============================================================================
 
-from pymilvus import Collection, AnnSearchRequest, RRFRanker
+import asyncio
+import functools
+import heapq
+import os
+from collections import OrderedDict, deque
+from typing import NamedTuple
 
-from .config import ef_bgem3, COLLECTION_NAME, llm
+import numpy as np
+from pymilvus import Collection, AnnSearchRequest, RRFRanker, MilvusException
+
+from .config import ef_bgem3, COLLECTION_NAME, llm, ensure_loaded, reconnect_milvus
+
+
+# Search each criterion with LLM-generated variations fused by RRF (QUERY_EXPANSION=1)
+QUERY_EXPANSION = os.environ.get("QUERY_EXPANSION", "0") == "1"
+# Reciprocal rank fusion: rank offset and per-retriever weights. With equal
+# weights Milvus fuses server-side (RRFRanker); otherwise sparse and dense
+# candidates are fetched separately and fused here.
+RRF_K = int(os.environ.get("RRF_K", "60"))
+SPARSE_WEIGHT = float(os.environ.get("RRF_SPARSE_WEIGHT", "1.0"))
+DENSE_WEIGHT = float(os.environ.get("RRF_DENSE_WEIGHT", "1.0"))
+# Candidates fetched per retriever for client-side fusion, as a multiple of limit
+CANDIDATE_FACTOR = 3
+
+_OUTPUT_FIELDS = ["text", "filename", "doc_type", "page_number"]
 
 
 def sparse_to_dict(sparse_array) -> dict[int, float]:
     """Converts scipy sparse array to dict format."""
     coo = sparse_array.tocoo()
-    return {int(i): float(v) for i, v in zip(coo.col, coo.data)}
+    # tolist() converts to Python ints/floats in one C loop
+    return dict(zip(coo.col.tolist(), coo.data.tolist()))
+
+
+# Variations per query text, least recently used first
+_EXPANSION_CACHE: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+# Maximum number of cached expansions
+EXPANSION_CACHE_MAX_ENTRIES = 2048
+# Recent (normalized dense embedding, variations) pairs for near-duplicate queries
+_SEMANTIC_CACHE: deque[tuple[np.ndarray, tuple[str, ...]]] = deque(maxlen=256)
+# Cosine similarity above which a cached expansion is reused
+SEMANTIC_CACHE_THRESHOLD = 0.95
 
 
-def expand_query(text: str) -> list[str]:
-    """Expands query with synonyms and semantic variations."""
+def _normalized_dense(text: str) -> np.ndarray:
+    """Returns the unit-length dense embedding of a query."""
+    dense = np.asarray(generate_query_embeddings(text)["dense"], dtype=np.float32)
+    norm = np.linalg.norm(dense)
+    return dense / norm if norm else dense
+
+
+async def expand_query(text: str) -> tuple[str, ...]:
+    """
+    Expands query with synonyms and semantic variations.
+    
+    Exact repeats are served from an LRU cache; otherwise the query's dense
+    embedding is compared with recently expanded queries and, above
+    SEMANTIC_CACHE_THRESHOLD, their variations are reused without an LLM
+    call. Failed LLM calls fall back to the plain query and are not cached.
+    
+    Args:
+        text: Query text
+    
+    Returns:
+        The query followed by up to two variations
+    """
+    cached = _EXPANSION_CACHE.get(text)
+    if cached is not None:
+        _EXPANSION_CACHE.move_to_end(text)
+        return cached
+    
+    dense = await asyncio.to_thread(_normalized_dense, text)
+    
+    if _SEMANTIC_CACHE:
+        recent = list(_SEMANTIC_CACHE)
+        similarities = np.stack([vec for vec, _ in recent]) @ dense
+        best = int(np.argmax(similarities))
+        if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return tuple(dict.fromkeys((text,) + recent[best][1][1:]))
+    
     prompt = f"""Generate 2 semantic variations of this search query:
 "{text}"
 
@@ -21,38 +88,96 @@ Use synonyms, related terms, or reformulations.
 Respond only with the queries, one per line, without numbering."""
     
     try:
-        response = llm.invoke(prompt)
-        variations = [v.strip() for v in response.content.strip().split('\n') if v.strip()]
-        return [text] + variations[:2]
-    except:
-        return [text]
+        response = await llm.ainvoke(prompt)
+    except Exception:
+        return (text,)
+    
+    variations = [v.strip() for v in response.content.strip().split('\n') if v.strip()]
+    variants = tuple(dict.fromkeys([text] + variations[:2]))
+    
+    _SEMANTIC_CACHE.append((dense, variants))
+    _EXPANSION_CACHE[text] = variants
+    if len(_EXPANSION_CACHE) > EXPANSION_CACHE_MAX_ENTRIES:
+        _EXPANSION_CACHE.popitem(last=False)
+    return variants
 
 
-def generate_query_embeddings(text: str) -> dict:
+# Loaded collection handles, one per collection name
+_COLLECTION_CACHE: dict[str, Collection] = {}
+
+
+def get_collection(name: str | None = None) -> Collection:
     """
-    Generates hybrid embeddings for a search query using BGE-M3.
-    
-    - Sparse: Learned sparse embeddings (lexical-like search)
-    - Dense: Dense embeddings (semantic search)
+    Returns a loaded handle of a collection, loading it once per process.
     
     Args:
-        text: Query text
+        name: Collection name (defaults to COLLECTION_NAME)
     
     Returns:
-        Dict with 'sparse' and 'dense' embeddings
+        Loaded pymilvus Collection
     """
-    # BGE-M3 encode_queries returns both sparse and dense
-    embeddings = ef_bgem3.encode_queries([text])
+    name = name or COLLECTION_NAME
+    col = _COLLECTION_CACHE.get(name)
+    if col is None:
+        col = Collection(name)
+        ensure_loaded(col)
+        _COLLECTION_CACHE[name] = col
+    return col
+
+
+# Search results keyed by (collection, query, filename, doc_type, limit),
+# least recently used first
+_CONTEXT_CACHE: OrderedDict[tuple, list[dict]] = OrderedDict()
+# Maximum number of cached search results
+CONTEXT_CACHE_MAX_ENTRIES = 1024
+
+
+def _context_key(criterion: str, filename: str | None, doc_type: str | None, limit: int) -> tuple:
+    """Builds the search-result cache key for the collection being searched."""
+    return (COLLECTION_NAME, criterion, filename, doc_type, limit)
+
+
+def _get_context(key: tuple) -> list[dict] | None:
+    """Returns cached search results, marking them as recently used."""
+    chunks = _CONTEXT_CACHE.get(key)
+    if chunks is not None:
+        _CONTEXT_CACHE.move_to_end(key)
+    return chunks
+
+
+def _put_context(key: tuple, chunks: list[dict]) -> None:
+    """Caches search results, evicting the least recently used entry."""
+    _CONTEXT_CACHE[key] = chunks
+    _CONTEXT_CACHE.move_to_end(key)
+    if len(_CONTEXT_CACHE) > CONTEXT_CACHE_MAX_ENTRIES:
+        _CONTEXT_CACHE.popitem(last=False)
+
+
+def clear_context_cache(collection_name: str | None = None) -> None:
+    """
+    Forgets memoized search results (call after re-indexing).
     
+    Args:
+        collection_name: Only forget results of this collection (default: all)
+    """
+    if collection_name is None:
+        _CONTEXT_CACHE.clear()
+        return
+    for key in [k for k in _CONTEXT_CACHE if k[0] == collection_name]:
+        del _CONTEXT_CACHE[key]
+
+
+def _to_query_embedding(embeddings: dict, i: int) -> dict:
+    """Converts the i-th BGE-M3 query output into sparse/dense search vectors."""
     # Extract sparse vector and convert to dict format
-    sparse_vector = sparse_to_dict(embeddings["sparse"][0])
+    sparse_vector = sparse_to_dict(embeddings["sparse"][i])
     
     # If sparse returns empty vector, use a placeholder
     if not sparse_vector:
         sparse_vector = {0: 0.0001}
 
     # Extract dense vector
-    dense_vector = embeddings["dense"][0]
+    dense_vector = embeddings["dense"][i]
     
     if hasattr(dense_vector, 'tolist'):
         dense_vector = dense_vector.tolist()
@@ -63,14 +188,288 @@ def generate_query_embeddings(text: str) -> dict:
     }
 
 
-async def search_relevant_context(
+@functools.lru_cache(maxsize=4096)
+def generate_query_embeddings(text: str) -> dict:
+    """
+    Generates hybrid embeddings for a search query using BGE-M3.
+    
+    - Sparse: Learned sparse embeddings (lexical-like search)
+    - Dense: Dense embeddings (semantic search)
+    
+    Results are cached per query text, so callers must not mutate them.
+    Use generate_query_embeddings.cache_clear() to reset the cache.
+    
+    Args:
+        text: Query text
+    
+    Returns:
+        Dict with 'sparse' and 'dense' embeddings
+    """
+    # BGE-M3 encode_queries returns both sparse and dense
+    embeddings = ef_bgem3.encode_queries([text])
+    return _to_query_embedding(embeddings, 0)
+
+
+def generate_query_embeddings_batch(texts: list[str]) -> list[dict]:
+    """
+    Generates hybrid embeddings for several queries with one model call.
+    
+    Args:
+        texts: Query texts
+    
+    Returns:
+        List of dicts with 'sparse' and 'dense' embeddings, in input order
+    """
+    embeddings = ef_bgem3.encode_queries(texts)
+    return [_to_query_embedding(embeddings, i) for i in range(len(texts))]
+
+
+class MetadataFilter(NamedTuple):
+    """Milvus filter template and the values bound to its placeholders."""
+    expr: str
+    params: dict
+
+
+@functools.lru_cache(maxsize=256)
+def build_filter(filename: str | None, doc_type: str | None) -> MetadataFilter | None:
+    """
+    Builds the Milvus metadata filter, once per combination.
+    
+    Values are passed as expression parameters instead of being quoted into
+    the expression, so names containing quotes cannot break the filter and
+    Milvus can reuse the parsed template across calls.
+    """
+    filters = []
+    params = {}
+    if filename:
+        filters.append("filename == {filename}")
+        params["filename"] = filename
+    if doc_type:
+        filters.append("doc_type == {doc_type}")
+        params["doc_type"] = doc_type
+    
+    return MetadataFilter(" and ".join(filters), params) if filters else None
+
+
+def _hybrid_search(
+    col: Collection,
+    embeddings: list[dict],
+    final_filter: MetadataFilter | None,
+    limit: int
+) -> list[list[dict]]:
+    """
+    Runs one hybrid search (sparse + dense) for any number of queries.
+    
+    Returns:
+        One chunk list (see hits_to_chunks) per query embedding, best first
+    """
+    sparse_search_params = {"metric_type": "IP"}
+    dense_search_params = {"metric_type": "COSINE"}
+    sparse_data = [e["sparse"] for e in embeddings]
+    dense_data = [e["dense"] for e in embeddings]
+    expr, expr_params = final_filter if final_filter else (None, None)
+    
+    if SPARSE_WEIGHT == DENSE_WEIGHT:
+        # Plain RRF: let Milvus fuse both requests in one round trip
+        sparse_req = AnnSearchRequest(
+            data=sparse_data,
+            anns_field="sparse_vector",
+            param=sparse_search_params,
+            limit=limit,
+            expr=expr,
+            expr_params=expr_params
+        )
+        dense_req = AnnSearchRequest(
+            data=dense_data,
+            anns_field="dense_vector",
+            param=dense_search_params,
+            limit=limit,
+            expr=expr,
+            expr_params=expr_params
+        )
+        results = col.hybrid_search(
+            reqs=[sparse_req, dense_req],
+            rerank=RRFRanker(RRF_K),
+            limit=limit,
+            output_fields=_OUTPUT_FIELDS
+        ) or []
+        chunks = [hits_to_chunks(hits) for hits in results]
+    else:
+        # Weighted RRF: fetch deeper candidate lists per retriever and fuse here
+        candidates = limit * CANDIDATE_FACTOR
+        sparse_results = col.search(
+            data=sparse_data,
+            anns_field="sparse_vector",
+            param=sparse_search_params,
+            limit=candidates,
+            expr=expr,
+            expr_params=expr_params,
+            output_fields=_OUTPUT_FIELDS
+        ) or []
+        dense_results = col.search(
+            data=dense_data,
+            anns_field="dense_vector",
+            param=dense_search_params,
+            limit=candidates,
+            expr=expr,
+            expr_params=expr_params,
+            output_fields=_OUTPUT_FIELDS
+        ) or []
+        chunks = [
+            fuse_rankings(
+                [hits_to_chunks(sparse_hits), hits_to_chunks(dense_hits)],
+                limit,
+                weights=(SPARSE_WEIGHT, DENSE_WEIGHT)
+            )
+            for sparse_hits, dense_hits in zip(sparse_results, dense_results)
+        ]
+    
+    # One (possibly empty) list per query, even if Milvus returned fewer
+    return chunks + [[] for _ in range(len(embeddings) - len(chunks))]
+
+
+async def run_hybrid_search(
+    embeddings: list[dict],
+    final_filter: MetadataFilter | None,
+    limit: int,
+    collection_name: str | None = None
+) -> list[list[dict]]:
+    """
+    Runs _hybrid_search on the cached collection handle off the event loop.
+    
+    If Milvus rejects the call (e.g. the server restarted and the channel
+    went stale), the connection is re-opened, the collection reloaded and
+    the search retried once.
+    
+    Returns:
+        One chunk list (see hits_to_chunks) per query embedding, best first
+    """
+    col = get_collection(collection_name)
+    try:
+        return await asyncio.to_thread(_hybrid_search, col, embeddings, final_filter, limit)
+    except MilvusException:
+        await asyncio.to_thread(reconnect_milvus)
+        _COLLECTION_CACHE.pop(collection_name or COLLECTION_NAME, None)
+        col = await asyncio.to_thread(get_collection, collection_name)
+        return await asyncio.to_thread(_hybrid_search, col, embeddings, final_filter, limit)
+
+
+def hits_to_chunks(hits) -> list[dict]:
+    """
+    Converts Milvus hits into plain chunk dicts.
+    
+    Returns:
+        List of dicts with pk, text, filename, doc_type, page and score
+    """
+    return [
+        {
+            "pk": hit.id,
+            "text": hit.entity.get('text', ''),
+            "filename": hit.entity.get('filename', 'N/A'),
+            "doc_type": hit.entity.get('doc_type', 'N/A'),
+            "page": hit.entity.get('page_number', 0),
+            "score": hit.distance,
+        }
+        for hit in hits or []
+    ]
+
+
+def fuse_rankings(
+    rankings: list[list[dict]],
+    limit: int,
+    weights: tuple[float, ...] | None = None
+) -> list[dict]:
+    """
+    Merges several ranked chunk lists with (weighted) reciprocal rank fusion.
+    
+    Each chunk scores sum(weight / (RRF_K + rank)) over the lists it
+    appears in, with rank starting at 1.
+    
+    Args:
+        rankings: Chunk lists (see hits_to_chunks), each best first
+        limit: Maximum number of chunks to keep
+        weights: Weight of each ranking (defaults to 1.0 each)
+    
+    Returns:
+        Chunks ordered by fused score, with "score" set to that score
+    """
+    if len(rankings) == 1 and weights is None:
+        return rankings[0][:limit]
+    
+    fused: dict[object, dict] = {}
+    for ranking, weight in zip(rankings, weights or [1.0] * len(rankings)):
+        for rank, chunk in enumerate(ranking, 1):
+            entry = fused.get(chunk["pk"])
+            if entry is None:
+                entry = fused[chunk["pk"]] = {**chunk, "score": 0.0}
+            entry["score"] += weight / (RRF_K + rank)
+    
+    return heapq.nlargest(limit, fused.values(), key=lambda c: c["score"])
+
+
+async def _search_expanded(
+    criteria: list[str],
+    final_filter: MetadataFilter | None,
+    limit: int
+) -> list[list[dict]]:
+    """
+    Searches every criterion together with its query variations.
+    
+    The LLM expansions run concurrently with loading the collection; the
+    criteria's own embeddings are already cached by the expansion step, so
+    only the new variations are encoded (in one model call). Everything is
+    then sent to Milvus as one multi-query request and each criterion's
+    result lists are fused with RRF.
+    
+    Returns:
+        One fused chunk list per criterion, in input order
+    """
+    variants, _ = await asyncio.gather(
+        asyncio.gather(*(expand_query(c) for c in criteria)),
+        asyncio.to_thread(get_collection)
+    )
+    
+    def _embed() -> list[dict]:
+        extras = [v for group in variants for v in group[1:]]
+        extra_embeddings = iter(generate_query_embeddings_batch(extras) if extras else [])
+        return [
+            generate_query_embeddings(v) if j == 0 else next(extra_embeddings)
+            for group in variants
+            for j, v in enumerate(group)
+        ]
+    
+    embeddings = await asyncio.to_thread(_embed)
+    results = await run_hybrid_search(embeddings, final_filter, limit)
+    
+    fused = []
+    start = 0
+    for group in variants:
+        fused.append(fuse_rankings(results[start:start + len(group)], limit))
+        start += len(group)
+    return fused
+
+
+def format_chunks(chunks: list[dict]) -> tuple[str, list[int]]:
+    """Formats chunks into context string and page list."""
+    if not chunks:
+        return "No context found.", []
+    
+    context = "\n\n---\n\n".join([
+        f"[File: {c['filename']} | Type: {c['doc_type']} | "
+        f"Page: {c['page']} | Score: {c['score']:.3f}]\n{c['text']}"
+        for c in chunks
+    ])
+    return context, [c["page"] for c in chunks]
+
+
+async def search_relevant_chunks(
     criterion: str, 
     limit: int = 5,
     filename: str | None = None,
     doc_type: str | None = None
-) -> tuple[str, list[int]]:
+) -> list[dict]:
     """
-    Searches for relevant excerpts using hybrid search (sparse + dense).
+    Searches for relevant chunks using hybrid search (sparse + dense).
     
     Args:
         criterion: Criterion text to search for
@@ -79,70 +478,94 @@ async def search_relevant_context(
         doc_type: Filter by document type
     
     Returns:
-        Tuple (formatted_context, list_of_pages)
+        List of chunk dicts (see hits_to_chunks), best first
     """
     
-    # ----- STEP 1: Generate hybrid embeddings -----
-    query_embeddings = generate_query_embeddings(criterion)
+    key = _context_key(criterion, filename, doc_type, limit)
+    cached = _get_context(key)
+    if cached is not None:
+        return cached
     
-    # ----- STEP 2: Get collection -----
-    col = Collection(COLLECTION_NAME)
-    col.load()
+    # ----- STEP 1: Build metadata filter -----
+    final_filter = build_filter(filename, doc_type)
     
-    # ----- STEP 3: Build metadata filter -----
-    filters = []
-    if filename:
-        filters.append(f'filename == "{filename}"')
-    if doc_type:
-        filters.append(f'doc_type == "{doc_type}"')
+    if QUERY_EXPANSION:
+        chunks = (await _search_expanded([criterion], final_filter, limit))[0]
+        _put_context(key, chunks)
+        return chunks
     
-    final_filter = " and ".join(filters) if filters else None
+    # ----- STEP 2: Generate hybrid embeddings (blocking inference, off the loop) -----
+    query_embeddings = await asyncio.to_thread(generate_query_embeddings, criterion)
     
-    # ----- STEP 4: Configure sparse and dense searches -----
-    sparse_search_params = {"metric_type": "IP"}
-    sparse_req = AnnSearchRequest(
-        data=[query_embeddings["sparse"]],
-        anns_field="sparse_vector",
-        param=sparse_search_params,
-        limit=limit,
-        expr=final_filter
-    )
+    # ----- STEP 3: Execute hybrid search on the cached collection -----
+    results = await run_hybrid_search([query_embeddings], final_filter, limit)
     
-    dense_search_params = {"metric_type": "COSINE"}
-    dense_req = AnnSearchRequest(
-        data=[query_embeddings["dense"]],
-        anns_field="dense_vector",
-        param=dense_search_params,
-        limit=limit,
-        expr=final_filter
-    )
+    # ----- STEP 4: Cache results -----
+    _put_context(key, results[0])
+    return results[0]
+
+
+async def search_relevant_context(
+    criterion: str, 
+    limit: int = 5,
+    filename: str | None = None,
+    doc_type: str | None = None
+) -> tuple[str, list[int]]:
+    """
+    Searches for relevant excerpts using hybrid search (sparse + dense).
     
-    # ----- STEP 5: Execute hybrid search -----
-    results = col.hybrid_search(
-        reqs=[sparse_req, dense_req],
-        rerank=RRFRanker(),
-        limit=limit,
-        output_fields=["text", "filename", "doc_type", "page_number"]
-    )
+    Args:
+        criterion: Criterion text to search for
+        limit: Maximum number of results
+        filename: Filter by filename
+        doc_type: Filter by document type
     
-    # ----- STEP 6: Process results -----
-    if not results or not results[0]:
-        return "No context found.", []
+    Returns:
+        Tuple (formatted_context, list_of_pages)
+    """
+    return format_chunks(await search_relevant_chunks(criterion, limit, filename, doc_type))
+
+
+async def search_relevant_context_batch(
+    criteria: list[str],
+    limit: int = 5,
+    filename: str | None = None,
+    doc_type: str | None = None
+) -> list[tuple[str, list[int]]]:
+    """
+    Searches the context of several criteria with a single hybrid search.
     
-    contexts = []
-    pages = []
-    
-    for hit in results[0]:
-        text = hit.entity.get('text', '')
-        file = hit.entity.get('filename', 'N/A')
-        type_doc = hit.entity.get('doc_type', 'N/A')
-        page = hit.entity.get('page_number', 0)
-        score = hit.distance
-        
-        pages.append(page)
-        
-        contexts.append(
-            f"[File: {file} | Type: {type_doc} | Page: {page} | Score: {score:.3f}]\n{text}"
-        )
+    Embeds every query not searched before in one model call and sends all
+    of them to Milvus in one request. Results are memoized, so later
+    search_relevant_context calls with the same arguments are served locally.
+    
+    Args:
+        criteria: Criterion texts to search for
+        limit: Maximum number of results per criterion
+        filename: Filter by filename
+        doc_type: Filter by document type
+    
+    Returns:
+        List of (formatted_context, list_of_pages), in input order
+    """
+    found: dict[str, list[dict]] = {}
+    for c in criteria:
+        if c not in found:
+            cached = _get_context(_context_key(c, filename, doc_type, limit))
+            if cached is not None:
+                found[c] = cached
+    missing = [c for c in dict.fromkeys(criteria) if c not in found]
+    
+    if missing and QUERY_EXPANSION:
+        results = await _search_expanded(missing, build_filter(filename, doc_type), limit)
+    elif missing:
+        embeddings = await asyncio.to_thread(generate_query_embeddings_batch, missing)
+        results = await run_hybrid_search(embeddings, build_filter(filename, doc_type), limit)
+    else:
+        results = []
+    
+    for criterion, chunks in zip(missing, results):
+        _put_context(_context_key(criterion, filename, doc_type, limit), chunks)
+        found[criterion] = chunks
     
-    return "\n\n---\n\n".join(contexts), pages
\ No newline at end of file
+    return [format_chunks(found[c]) for c in criteria]
@@ -1,33 +1,41 @@
 # milvus package
-from .config import MILVUS_URI, COLLECTION_NAME, CHUNK_SIZE, CHUNK_OVERLAP, DENSE_DIM
-from .indexer import index_document, check_document_exists, initialize_collection
-from .collection import (
-    list_indexed_documents,
-    count_chunks_by_document,
-    remove_document,
-    get_collection_stats,
-    clear_collection
-)
-from .extractor import extract_text_from_pdf
-from .chunker import create_chunks_by_page
-from .models import ChunkMetadata, IndexedDocument
+# ============================================================================
+# Public names are imported from their submodule on first access, so that
+# importing one light submodule (e.g. extractor, in spawned worker processes)
+# does not load the embedding model pulled in by the indexer.
+# ============================================================================
 
-__all__ = [
-    "MILVUS_URI",
-    "COLLECTION_NAME", 
-    "CHUNK_SIZE",
-    "CHUNK_OVERLAP",
-    "DENSE_DIM",
-    "index_document",
-    "check_document_exists",
-    "initialize_collection",
-    "list_indexed_documents",
-    "count_chunks_by_document",
-    "remove_document",
-    "get_collection_stats",
-    "clear_collection",
-    "extract_text_from_pdf",
-    "create_chunks_by_page",
-    "ChunkMetadata",
-    "IndexedDocument"
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "MILVUS_URI": "config",
+    "COLLECTION_NAME": "config",
+    "CHUNK_SIZE": "config",
+    "CHUNK_OVERLAP": "config",
+    "DENSE_DIM": "config",
+    "index_document": "indexer",
+    "check_document_exists": "indexer",
+    "initialize_collection": "indexer",
+    "list_indexed_documents": "collection",
+    "count_chunks_by_document": "collection",
+    "remove_document": "collection",
+    "get_collection_stats": "collection",
+    "clear_collection": "collection",
+    "clear_scan_cache": "collection",
+    "extract_text_from_pdf": "extractor",
+    "create_chunks_by_page": "chunker",
+    "ChunkMetadata": "models",
+    "IndexedDocument": "models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,10 +1,23 @@
 # chunker.py - Text Chunking Functions
 # ============================================================================
 
+import functools
+
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from .config import CHUNK_SIZE, CHUNK_OVERLAP
 
 
+@functools.lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Returns the splitter for a chunk configuration, built once per process."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", ", ", " ", ""],
+        length_function=len,
+    )
+
+
 def create_chunks_by_page(
     pages: list[dict] | list[tuple[int, str]],
     chunk_size: int = CHUNK_SIZE,
@@ -23,12 +36,7 @@ def create_chunks_by_page(
         List of dicts with 'text' and 'page_number'
     """
     
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ". ", ", ", " ", ""],
-        length_function=len,
-    )
+    text_splitter = _get_splitter(chunk_size, chunk_overlap)
     
     all_chunks = []
     
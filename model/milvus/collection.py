@@ -1,17 +1,51 @@
 # collection.py - Milvus Collection Management
 # ============================================================================
 
+import time
+from collections import Counter
+
 from rich.console import Console
-from pymilvus import connections, utility, Collection
+from pymilvus import connections, utility, Collection, LoadState
 
 from .config import MILVUS_URI, COLLECTION_NAME
 
 console = Console()
 
 
+# Loaded collection handles, one per collection name
+_COL_CACHE: dict[str, Collection] = {}
+_connected = False
+
+# Seconds a filename scan of a collection stays valid
+SCAN_CACHE_TTL = 30
+# Rows fetched per round trip when scanning a collection
+SCAN_BATCH_SIZE = 1000
+# Chunk count per filename, with the time it was scanned, per collection name
+_SCAN_CACHE: dict[str, tuple[float, dict[str, int]]] = {}
+
+
+def _connect() -> None:
+    """Opens the default Milvus connection once per process."""
+    global _connected
+    if not _connected:
+        connections.connect(alias="default", uri=MILVUS_URI)
+        _connected = True
+
+
+def _str_literal(value: str) -> str:
+    """Quotes a string for a Milvus boolean expression, escaping quotes and backslashes."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _ensure_loaded(col: Collection, using: str = "default") -> None:
+    """Loads a collection unless the server already has it in memory."""
+    if utility.load_state(col.name, using=using) != LoadState.Loaded:
+        col.load()
+
+
 def _get_collection(collection_name: str = None) -> Collection | None:
     """
-    Gets the Milvus collection if it exists.
+    Gets the Milvus collection if it exists, loading it once per process.
     
     Args:
         collection_name: Optional override for collection name
@@ -20,13 +54,18 @@ def _get_collection(collection_name: str = None) -> Collection | None:
         Collection or None if it doesn't exist
     """
     col_name = collection_name or COLLECTION_NAME
-    connections.connect(uri=MILVUS_URI)
+    _connect()
+    
+    col = _COL_CACHE.get(col_name)
+    if col is not None:
+        return col
     
     if not utility.has_collection(col_name):
         return None
     
     col = Collection(col_name)
-    col.load()
+    _ensure_loaded(col)
+    _COL_CACHE[col_name] = col
     return col
 
 
@@ -51,13 +90,16 @@ def check_document_exists(
         return False
     
     try:
-        # Build expression
-        expr = f'filename == "{filename}"'
+        # Build expression (values bound as parameters, never quoted in)
+        expr = "filename == {filename}"
+        expr_params = {"filename": filename}
         if doc_type:
-            expr += f' and doc_type == "{doc_type}"'
+            expr += " and doc_type == {doc_type}"
+            expr_params["doc_type"] = doc_type
         
         result = col.query(
             expr=expr,
+            expr_params=expr_params,
             output_fields=["pk"],
             limit=1
         )
@@ -66,6 +108,48 @@ def check_document_exists(
         return False
 
 
+def clear_scan_cache(collection_name: str = None) -> None:
+    """
+    Forgets cached filename scans (call after inserting or deleting chunks).
+    
+    Args:
+        collection_name: Collection to forget; all collections if None
+    """
+    if collection_name is None:
+        _SCAN_CACHE.clear()
+    else:
+        _SCAN_CACHE.pop(collection_name, None)
+
+
+def _scan_filenames(col: Collection, col_name: str) -> dict[str, int]:
+    """
+    Counts chunks per filename with a full scan, reused for SCAN_CACHE_TTL seconds.
+    
+    Raises:
+        Exception: If the Milvus query fails (failures are not cached)
+    """
+    entry = _SCAN_CACHE.get(col_name)
+    if entry is not None and time.monotonic() - entry[0] <= SCAN_CACHE_TTL:
+        return entry[1]
+    
+    # Page through the whole collection; a plain query is capped at 10000 rows
+    count = Counter()
+    iterator = col.query_iterator(
+        batch_size=SCAN_BATCH_SIZE,
+        expr="",
+        output_fields=["filename"]
+    )
+    try:
+        while batch := iterator.next():
+            count.update(r["filename"] for r in batch)
+    finally:
+        iterator.close()
+    count = dict(count)
+    
+    _SCAN_CACHE[col_name] = (time.monotonic(), count)
+    return count
+
+
 def list_indexed_documents(collection_name: str = None) -> list[str]:
     """
     Lists all unique documents indexed in the collection.
@@ -76,19 +160,13 @@ def list_indexed_documents(collection_name: str = None) -> list[str]:
     Returns:
         List of unique filenames
     """
-    col = _get_collection(collection_name)
+    col_name = collection_name or COLLECTION_NAME
+    col = _get_collection(col_name)
     if col is None:
         return []
     
     try:
-        result = col.query(
-            expr="",
-            output_fields=["filename"],
-            limit=10000
-        )
-        
-        filenames = set(r["filename"] for r in result)
-        return sorted(list(filenames))
+        return sorted(_scan_filenames(col, col_name))
         
     except Exception as e:
         console.print(f"[red]Error listing documents: {e}[/red]")
@@ -105,23 +183,13 @@ def count_chunks_by_document(collection_name: str = None) -> dict[str, int]:
     Returns:
         Dict with filename -> chunk count
     """
-    col = _get_collection(collection_name)
+    col_name = collection_name or COLLECTION_NAME
+    col = _get_collection(col_name)
     if col is None:
         return {}
     
     try:
-        result = col.query(
-            expr="",
-            output_fields=["filename"],
-            limit=10000
-        )
-        
-        count = {}
-        for r in result:
-            filename = r["filename"]
-            count[filename] = count.get(filename, 0) + 1
-        
-        return count
+        return dict(_scan_filenames(col, col_name))
         
     except Exception as e:
         console.print(f"[red]Error counting chunks: {e}[/red]")
@@ -145,7 +213,8 @@ def remove_document(filename: str, collection_name: str = None) -> bool:
         return False
     
     try:
-        col.delete(expr=f'filename == "{filename}"')
+        col.delete(expr=f"filename == {_str_literal(filename)}")
+        clear_scan_cache(collection_name or COLLECTION_NAME)
         console.print(f"[green]✓ Document '{filename}' removed[/green]")
         return True
         
@@ -196,7 +265,11 @@ def clear_collection(collection_name: str = None) -> bool:
         True if removed successfully
     """
     col_name = collection_name or COLLECTION_NAME
-    connections.connect(uri=MILVUS_URI)
+    _connect()
+    
+    # A dropped collection's handle and scans must not be served again
+    _COL_CACHE.pop(col_name, None)
+    clear_scan_cache(col_name)
     
     if utility.has_collection(col_name):
         Collection(col_name).drop()
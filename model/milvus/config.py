@@ -4,6 +4,8 @@ import os
 import sys
 import warnings
 from pathlib import Path
+
+import torch
 from dotenv import load_dotenv
 
 # Add parent directories to path for imports
@@ -34,3 +36,11 @@ except (ImportError, FileNotFoundError):
     CHUNK_OVERLAP = int(os.environ.get("CHUNK_OVERLAP", "100"))
     DENSE_DIM = int(os.environ.get("DENSE_DIM", "1024"))  # BGE-M3 default
     BM25_MODEL_PATH = os.environ.get("BM25_MODEL_PATH", "./output/bm25_model.json")
+
+# Embedding device: GPU in FP16 when available; override with EF_DEVICE / EF_FP16.
+# On CPU-only hosts, torch is allowed to use every core.
+EF_DEVICE = os.environ.get("EF_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+EF_FP16 = os.environ.get("EF_FP16", "1" if EF_DEVICE.startswith("cuda") else "0") == "1"
+
+if EF_DEVICE == "cpu":
+    torch.set_num_threads(os.cpu_count() or 1)
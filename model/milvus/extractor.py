@@ -1,7 +1,9 @@
 # extractor.py - PDF Text Extraction Functions
 # ============================================================================
 
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from rich.console import Console
 
 try:
@@ -14,25 +16,61 @@ except ImportError:
 console = Console()
 
 
+# PDFs with fewer pages are extracted serially (process startup outweighs the gain)
+PARALLEL_MIN_PAGES = 20
+
+
+def _extract_pdfplumber_range(pdf_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extracts pages [start, stop) with pdfplumber; runs in worker processes."""
+    pages = []
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        for i in range(start, stop):
+            text = pdf.pages[i].extract_text()
+            if text and text.strip():
+                pages.append((i + 1, text))
+    
+    return pages
+
+
 def extract_text_pdfplumber(pdf_path: str) -> list[tuple[int, str]]:
     """
     Extracts text from a PDF using pdfplumber (better quality).
     
+    Large PDFs are split into one contiguous page range per CPU core and
+    extracted in worker processes, each re-opening the file (pdfplumber
+    objects cannot be pickled).
+    
     Args:
         pdf_path: Path to the PDF file
     
     Returns:
         List of tuples (page_number, page_text)
     """
-    pages = []
-    
     with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages, 1):
-            text = page.extract_text()
-            if text and text.strip():
-                pages.append((i, text))
+        total = len(pdf.pages)
     
-    return pages
+    workers = min(os.cpu_count() or 1, total)
+    if total < PARALLEL_MIN_PAGES or workers <= 1:
+        return _extract_pdfplumber_range(pdf_path, 0, total)
+    
+    step = -(-total // workers)
+    starts = range(0, total, step)
+    
+    # Spawn fresh workers: forking a process that already holds gRPC channels
+    # and torch threads (and, in the pipeline, runs this from a worker
+    # thread) can deadlock the child
+    with ProcessPoolExecutor(
+        max_workers=len(starts),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        parts = pool.map(
+            _extract_pdfplumber_range,
+            [pdf_path] * len(starts),
+            starts,
+            [min(start + step, total) for start in starts]
+        )
+        return [page for part in parts for page in part]
 
 
 def extract_text_pypdf2(pdf_path: str) -> list[tuple[int, str]]:
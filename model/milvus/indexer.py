@@ -1,5 +1,7 @@
 # indexer.py - Main Indexing Logic with Hybrid Search
 # ==============================================================================
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from rich.console import Console
@@ -15,25 +17,34 @@ from pymilvus import (
 )
 from pymilvus.model.hybrid import BGEM3EmbeddingFunction
 
-from .config import COLLECTION_NAME, CHUNK_SIZE, CHUNK_OVERLAP, MILVUS_URI, DENSE_DIM, BM25_MODEL_PATH
+from .config import (
+    COLLECTION_NAME, CHUNK_SIZE, CHUNK_OVERLAP, MILVUS_URI, DENSE_DIM, BM25_MODEL_PATH,
+    EF_DEVICE, EF_FP16,
+)
+from .collection import _ensure_loaded, _str_literal, clear_scan_cache
 from .models import IndexedDocument
 from .extractor import extract_text_from_pdf
 from .chunker import create_chunks_by_page
 
 console = Console()
 
+# The indexer keeps its own connection so it can run next to an audit, which
+# may drop and re-open the default one
+INDEXER_ALIAS = "indexer"
+
 # =============================================================================
 # HYBRID EMBEDDING MODEL INITIALIZATION
 # =============================================================================
 
 # BGE-M3 provides both sparse and dense embeddings in a single model
-ef_bgem3 = BGEM3EmbeddingFunction(use_fp16=False, device="cpu")
+ef_bgem3 = BGEM3EmbeddingFunction(use_fp16=EF_FP16, device=EF_DEVICE)
 
 
 def sparse_to_dict(sparse_array) -> dict[int, float]:
     """Converts sparse array from scipy to Milvus format."""
     coo = sparse_array.tocoo()
-    return {int(i): float(v) for i, v in zip(coo.col, coo.data)}
+    # tolist() converts to Python ints/floats in one C loop
+    return dict(zip(coo.col.tolist(), coo.data.tolist()))
 
 
 def generate_hybrid_embeddings(texts: list[str]) -> dict:
@@ -67,6 +78,10 @@ def generate_hybrid_embeddings(texts: list[str]) -> dict:
 # COLLECTION MANAGEMENT
 # =============================================================================
 
+# Guards the drop/create sequence in initialize_collection
+_COLLECTION_LOCK = threading.Lock()
+
+
 def initialize_collection(
     reset: bool = False,
     collection_name: str = None,
@@ -86,88 +101,91 @@ def initialize_collection(
     uri = milvus_uri or MILVUS_URI
     dim = dense_dim or DENSE_DIM
     
-    connections.connect(uri=uri)
-
-    if reset and utility.has_collection(col_name):
-        console.print(f"[yellow]⚠ Removing existing collection: {col_name}[/yellow]")
-        Collection(col_name).drop()
-
-    if not utility.has_collection(col_name):
-        console.print(f"[cyan]Creating collection: {col_name}[/cyan]")
-
-        fields = [
-            FieldSchema(
-                name="pk",
-                dtype=DataType.VARCHAR,
-                is_primary=True,
-                auto_id=True,
-                max_length=100
-            ),
-            FieldSchema(
-                name="text",
-                dtype=DataType.VARCHAR,
-                max_length=8000
-            ),
-            FieldSchema(
-                name="filename",
-                dtype=DataType.VARCHAR,
-                max_length=500
-            ),
-            FieldSchema(
-                name="doc_type",
-                dtype=DataType.VARCHAR,
-                max_length=100
-            ),
-            FieldSchema(
-                name="page_number",
-                dtype=DataType.INT64
-            ),
-            FieldSchema(
-                name="chunk_index",
-                dtype=DataType.INT64
-            ),
-            FieldSchema(
-                name="total_chunks",
-                dtype=DataType.INT64
-            ),
-            FieldSchema(
-                name="sparse_vector",
-                dtype=DataType.SPARSE_FLOAT_VECTOR
-            ),
-            FieldSchema(
-                name="dense_vector",
-                dtype=DataType.FLOAT_VECTOR,
-                dim=dim
-            ),
-        ]
-
-        schema = CollectionSchema(
-            fields,
-            description="Documents for auditing with hybrid search (BGE-M3 sparse + dense)"
-        )
-        col = Collection(col_name, schema)
-
-        console.print("[cyan]Creating indexes...[/cyan]")
+    with _COLLECTION_LOCK:
+        connections.connect(alias=INDEXER_ALIAS, uri=uri)
+
+        if reset and utility.has_collection(col_name, using=INDEXER_ALIAS):
+            console.print(f"[yellow]⚠ Removing existing collection: {col_name}[/yellow]")
+            Collection(col_name, using=INDEXER_ALIAS).drop()
+            clear_scan_cache(col_name)
+
+        if not utility.has_collection(col_name, using=INDEXER_ALIAS):
+            console.print(f"[cyan]Creating collection: {col_name}[/cyan]")
+
+            fields = [
+                FieldSchema(
+                    name="pk",
+                    dtype=DataType.VARCHAR,
+                    is_primary=True,
+                    auto_id=True,
+                    max_length=100
+                ),
+                FieldSchema(
+                    name="text",
+                    dtype=DataType.VARCHAR,
+                    max_length=8000
+                ),
+                FieldSchema(
+                    name="filename",
+                    dtype=DataType.VARCHAR,
+                    max_length=500
+                ),
+                FieldSchema(
+                    name="doc_type",
+                    dtype=DataType.VARCHAR,
+                    max_length=100
+                ),
+                FieldSchema(
+                    name="page_number",
+                    dtype=DataType.INT64
+                ),
+                FieldSchema(
+                    name="chunk_index",
+                    dtype=DataType.INT64
+                ),
+                FieldSchema(
+                    name="total_chunks",
+                    dtype=DataType.INT64
+                ),
+                FieldSchema(
+                    name="sparse_vector",
+                    dtype=DataType.SPARSE_FLOAT_VECTOR
+                ),
+                FieldSchema(
+                    name="dense_vector",
+                    dtype=DataType.FLOAT_VECTOR,
+                    dim=dim
+                ),
+            ]
+
+            schema = CollectionSchema(
+                fields,
+                description="Documents for auditing with hybrid search (BGE-M3 sparse + dense)"
+            )
+            col = Collection(col_name, schema, using=INDEXER_ALIAS)
+
+            console.print("[cyan]Creating indexes...[/cyan]")
         
-        sparse_index = {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "IP"}
-        col.create_index("sparse_vector", sparse_index)
+            sparse_index = {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "IP"}
+            col.create_index("sparse_vector", sparse_index)
         
-        dense_index = {"index_type": "AUTOINDEX", "metric_type": "COSINE"}
-        col.create_index("dense_vector", dense_index)
+            dense_index = {"index_type": "AUTOINDEX", "metric_type": "COSINE"}
+            col.create_index("dense_vector", dense_index)
 
-        console.print("[green]✓ Collection created successfully[/green]")
-    else:
-        col = Collection(col_name)
+            console.print("[green]✓ Collection created successfully[/green]")
+        else:
+            col = Collection(col_name, using=INDEXER_ALIAS)
 
-    col.load()
-    return col
+        _ensure_loaded(col, using=INDEXER_ALIAS)
+        return col
 
 
 def check_document_exists(
     filename: str,
     doc_type: str = None,
     collection_name: str = None,
-    milvus_uri: str = None
+    milvus_uri: str = None,
+    col: Collection = None
 ) -> bool:
     """
     Checks if a document has already been indexed.
@@ -177,25 +195,30 @@ def check_document_exists(
         doc_type: Document type filter
         collection_name: Override for collection name
         milvus_uri: Override for Milvus URI
+        col: Already loaded collection; skips connecting and loading by name
     """
-    col_name = collection_name or COLLECTION_NAME
-    uri = milvus_uri or MILVUS_URI
-    
-    connections.connect(uri=uri)
+    if col is None:
+        col_name = collection_name or COLLECTION_NAME
+        uri = milvus_uri or MILVUS_URI
+        
+        connections.connect(alias=INDEXER_ALIAS, uri=uri)
 
-    if not utility.has_collection(col_name):
-        return False
+        if not utility.has_collection(col_name, using=INDEXER_ALIAS):
+            return False
 
-    col = Collection(col_name)
-    col.load()
+        col = Collection(col_name, using=INDEXER_ALIAS)
+        _ensure_loaded(col, using=INDEXER_ALIAS)
 
-    # Build expression
-    expr = f'filename == "{filename}"'
+    # Build expression (values bound as parameters, never quoted in)
+    expr = "filename == {filename}"
+    expr_params = {"filename": filename}
     if doc_type:
-        expr += f' and doc_type == "{doc_type}"'
+        expr += " and doc_type == {doc_type}"
+        expr_params["doc_type"] = doc_type
 
     results = col.query(
         expr=expr,
+        expr_params=expr_params,
         limit=1,
         output_fields=["pk"]
     )
@@ -212,11 +235,12 @@ def index_document(
     doc_type: str = "contract",
     reset_collection: bool = False,
     skip_if_exists: bool = True,
-    batch_size: int = 10,
+    batch_size: int = 64,
     collection_name: str = None,
     milvus_uri: str = None,
     chunk_size: int = None,
-    chunk_overlap: int = None
+    chunk_overlap: int = None,
+    show_progress: bool = True
 ) -> IndexedDocument | None:
     """
     Processes and indexes a PDF document in Milvus with hybrid search.
@@ -231,6 +255,8 @@ def index_document(
         milvus_uri: Override for Milvus URI
         chunk_size: Override for chunk size
         chunk_overlap: Override for chunk overlap
+        show_progress: If False, no progress bar is drawn (e.g. while another
+            live display is active on the terminal)
     
     Returns:
         IndexedDocument with results or None if skipped/failed
@@ -261,8 +287,7 @@ def index_document(
     if skip_if_exists and check_document_exists(
         filename=filename,
         doc_type=doc_type,
-        collection_name=col_name,
-        milvus_uri=uri
+        col=col
     ):
         console.print(f"[yellow]⚠ Document '{filename}' (type: {doc_type}) already indexed. Skipping...[/yellow]")
         return None
@@ -291,51 +316,79 @@ def index_document(
     total_chunks = len(chunks)
     console.print(f"    [green]✓ {total_chunks} chunks created[/green]")
 
-    # ----- STEP 5: Generate hybrid embeddings with BGE-M3 -----
-    console.print("[bold]3/4[/bold] Generating hybrid embeddings with BGE-M3 (sparse + dense)...")
-
-    data_to_insert = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        console=console
-    ) as progress:
-        task = progress.add_task("Processing chunks...", total=total_chunks)
-
-        for i in range(0, total_chunks, batch_size):
-            batch_chunks = chunks[i:i + batch_size]
-            batch_texts = [c["text"] for c in batch_chunks]
-
-            batch_embeddings = generate_hybrid_embeddings(batch_texts)
-
-            for j, chunk_info in enumerate(batch_chunks):
-                idx = i + j
-                data_to_insert.append({
-                    "text": chunk_info["text"],
-                    "filename": filename,
-                    "doc_type": doc_type,
-                    "page_number": chunk_info["page_number"],
-                    "chunk_index": idx,
-                    "total_chunks": total_chunks,
-                    "sparse_vector": batch_embeddings["sparse"][j],
-                    "dense_vector": batch_embeddings["dense"][j],
-                })
-
-            progress.update(task, advance=len(batch_chunks))
+    # ----- STEP 5/6: Generate hybrid embeddings with BGE-M3 and insert in Milvus -----
+    # Embedding of the next batch runs in a worker thread while the current
+    # batch is inserted, so model inference and Milvus I/O overlap.
+    console.print("[bold]3/4[/bold] Generating hybrid embeddings with BGE-M3 (sparse + dense) and inserting...")
 
-    # ----- STEP 6: Insert in Milvus -----
-    console.print("[bold]4/4[/bold] Inserting in Milvus...")
+    inserted = 0
+    # Primary keys of the rows inserted so far, for rollback
+    inserted_pks = []
 
     try:
-        col.insert(data_to_insert)
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            console=console,
+            disable=not show_progress
+        ) as progress, ThreadPoolExecutor(max_workers=1) as pool:
+            task = progress.add_task("Processing chunks...", total=total_chunks)
+
+            # Document-level columns, built once and sliced per batch
+            texts = [c["text"] for c in chunks]
+            page_numbers = [c["page_number"] for c in chunks]
+            chunk_indexes = list(range(total_chunks))
+
+            next_embeddings = pool.submit(generate_hybrid_embeddings, texts[:batch_size])
+
+            for i in range(0, total_chunks, batch_size):
+                batch_end = min(i + batch_size, total_chunks)
+                n = batch_end - i
+                batch_embeddings = next_embeddings.result()
+
+                # Start encoding the next batch before inserting this one
+                if batch_end < total_chunks:
+                    next_embeddings = pool.submit(
+                        generate_hybrid_embeddings, texts[batch_end:batch_end + batch_size]
+                    )
+
+                # Columnar insert, one list per field in schema order (pk is auto_id)
+                result = col.insert([
+                    texts[i:batch_end],
+                    [filename] * n,
+                    [doc_type] * n,
+                    page_numbers[i:batch_end],
+                    chunk_indexes[i:batch_end],
+                    [total_chunks] * n,
+                    batch_embeddings["sparse"],
+                    batch_embeddings["dense"],
+                ])
+                inserted_pks.extend(result.primary_keys)
+                inserted += n
+
+                progress.update(task, advance=n)
+
+        console.print("[bold]4/4[/bold] Flushing Milvus...")
         col.flush()
-        console.print(f"    [green]✓ {len(data_to_insert)} vectors inserted[/green]")
+        clear_scan_cache(col_name)
+        console.print(f"    [green]✓ {inserted} vectors inserted[/green]")
 
     except Exception as e:
-        console.print(f"[red]✗ Error inserting in Milvus: {e}[/red]")
+        console.print(f"[red]✗ Error indexing in Milvus: {e}[/red]")
+        if inserted_pks:
+            # Do not leave a partially indexed document behind. Only the rows
+            # of this run are removed: an earlier copy of the same document
+            # stays in place.
+            try:
+                col.delete(expr=f"pk in [{', '.join(_str_literal(pk) for pk in inserted_pks)}]")
+            except Exception as rollback_error:
+                console.print(
+                    f"[yellow]⚠ Could not remove the {len(inserted_pks)} chunks inserted "
+                    f"for {filename}: {rollback_error}[/yellow]"
+                )
+            clear_scan_cache(col_name)
         return None
 
     # ----- RESULT -----
@@ -344,7 +397,7 @@ def index_document(
         doc_type=doc_type,
         total_pages=len(pages),
         total_chunks=total_chunks,
-        indexed_chunks=len(data_to_insert)
+        indexed_chunks=inserted
     )
 
     console.print(Panel.fit(
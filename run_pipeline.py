@@ -17,6 +17,7 @@
 
 import argparse
 import asyncio
+import functools
 import sys
 from pathlib import Path
 
@@ -56,42 +57,142 @@ def display_config_summary(config: Config):
     console.print()
 
 
-def check_document_indexed(config: Config, doc: DocumentConfig) -> bool:
+# Rows fetched per round trip when checking which documents are indexed
+INDEX_CHECK_BATCH_SIZE = 1000
+
+def _open_collection(config: Config):
     """
-    Checks if a document is already indexed in Milvus.
+    Connects to Milvus and returns the configured collection, loaded.
     
     Args:
         config: Pipeline configuration
-        doc: Document configuration
     
     Returns:
-        True if document is indexed, False otherwise
+        Loaded pymilvus Collection, or None if it does not exist
     """
-    try:
-        from pymilvus import connections, utility, Collection
-        
-        connections.connect(uri=config.milvus.uri)
-        
-        if not utility.has_collection(config.milvus.collection_name):
-            return False
-        
-        col = Collection(config.milvus.collection_name)
+    from pymilvus import connections, utility, Collection, LoadState
+    
+    connections.connect(uri=config.milvus.uri)
+    
+    name = config.milvus.collection_name
+    if not utility.has_collection(name):
+        return None
+    
+    col = Collection(name)
+    if utility.load_state(name) != LoadState.Loaded:
         col.load()
+    return col
+
+
+def check_documents_indexed(config: Config, docs: list[DocumentConfig]) -> set[tuple[str, str]]:
+    """
+    Finds which documents are already indexed in Milvus, in a single query.
+    
+    Args:
+        config: Pipeline configuration
+        docs: Document configurations to check
+    
+    Returns:
+        (filename, doc_type) pairs of the documents that are indexed
+    """
+    wanted = {(doc.filename, doc.doc_type) for doc in docs}
+    if not wanted:
+        return set()
+    
+    try:
+        col = _open_collection(config)
+        if col is None:
+            return set()
         
-        results = col.query(
-            expr=f'filename == "{doc.filename}" and doc_type == "{doc.doc_type}"',
-            output_fields=["pk"],
-            limit=1
+        # Rows are chunks, so keep reading until every document was seen
+        found = set()
+        iterator = col.query_iterator(
+            batch_size=INDEX_CHECK_BATCH_SIZE,
+            expr="filename in {filenames} and doc_type in {doc_types}",
+            expr_params={
+                "filenames": sorted({f for f, _ in wanted}),
+                "doc_types": sorted({t for _, t in wanted}),
+            },
+            output_fields=["filename", "doc_type"]
         )
+        try:
+            while found != wanted and (batch := iterator.next()):
+                found.update((r["filename"], r["doc_type"]) for r in batch)
+                found &= wanted
+        finally:
+            iterator.close()
         
-        return len(results) > 0
+        return found
         
     except Exception as e:
         console.print(f"[yellow]⚠ Error checking index: {e}[/yellow]")
-        return False
+        return set()
+
+
+@functools.lru_cache(maxsize=1)
+def _milvus_index():
+    """Imports the Milvus indexer (and its embedding model) on first use."""
+    from model.milvus.indexer import index_document
+    return index_document
+
+
+@functools.lru_cache(maxsize=1)
+def _audit_api():
+    """Imports the audit stack on first use: run_audit, output module, update_config."""
+    from model.application.auditor import run_audit
+    from model.application import output
+    from model.application.config import update_config
+    return run_audit, output, update_config
+
+
+def invalidate_audit_caches(collection_name: str) -> None:
+    """
+    Drops audit-side caches of a collection that was just (re)indexed.
+    
+    Only modules already imported can hold cached results, so nothing is
+    imported here.
+    
+    Args:
+        collection_name: Collection that changed
+    """
+    retriever = sys.modules.get("model.application.retriever")
+    if retriever is not None:
+        retriever.clear_context_cache(collection_name)
+    deep_agent = sys.modules.get("model.application.deep_agent")
+    if deep_agent is not None:
+        deep_agent.clear_chunk_count_cache(collection_name)
 
 
-def index_document(config: Config, doc: DocumentConfig, reset: bool = False) -> bool:
+def warm_up_audit(config: Config) -> None:
+    """
+    Prepares the audit stack before the first audit: warms up the query
+    embedding model and loads the audited collection into Milvus memory.
+    
+    Collection failures are reported but not fatal: searches load the
+    collection on first use anyway.
+    
+    Args:
+        config: Pipeline configuration
+    """
+    from model.application.config import warm_up_embeddings
+    from model.application.retriever import get_collection
+    
+    warm_up_embeddings()
+    
+    try:
+        get_collection(config.milvus.collection_name)
+    except Exception as e:
+        console.print(
+            f"[yellow]⚠ Could not preload collection {config.milvus.collection_name}: {e}[/yellow]"
+        )
+
+
+def index_document(
+    config: Config,
+    doc: DocumentConfig,
+    reset: bool = False,
+    show_progress: bool = True
+) -> bool:
     """
     Indexes a document in Milvus.
     
@@ -99,14 +200,13 @@ def index_document(config: Config, doc: DocumentConfig, reset: bool = False) ->
         config: Pipeline configuration
         doc: Document configuration
         reset: If True, resets the collection before indexing
+        show_progress: If False, the indexer draws no progress bar
     
     Returns:
         True if successful, False otherwise
     """
-    from model.milvus.indexer import index_document as milvus_index
-    
     try:
-        result = milvus_index(
+        result = _milvus_index()(
             pdf_path=doc.path,
             doc_type=doc.doc_type,
             reset_collection=reset,
@@ -114,7 +214,8 @@ def index_document(config: Config, doc: DocumentConfig, reset: bool = False) ->
             collection_name=config.milvus.collection_name,
             milvus_uri=config.milvus.uri,
             chunk_size=config.chunking.chunk_size,
-            chunk_overlap=config.chunking.chunk_overlap
+            chunk_overlap=config.chunking.chunk_overlap,
+            show_progress=show_progress
         )
         return result is not None
     except Exception as e:
@@ -135,24 +236,14 @@ async def run_audit_for_document(config: Config, doc: DocumentConfig):
     Returns:
         AuditReport or None if failed
     """
-    from model.application.auditor import run_audit
-    from model.application.output import (
-        display_table,
-        display_json,
-        save_json,
-        save_table_txt
-    )
-    from model.application.config import update_config
+    run_audit, output, update_config = _audit_api()
     
     # Update application config
     update_config(
         milvus_uri=config.milvus.uri,
         collection_name=config.milvus.collection_name,
         output_dir=config.output.directory,
-        audit_criteria=[
-            {"query": c.query, "confidence": c.confidence}
-            for c in config.audit_criteria
-        ]
+        audit_criteria=config.audit_criteria
     )
     
     try:
@@ -165,16 +256,15 @@ async def run_audit_for_document(config: Config, doc: DocumentConfig):
         )
         
         # Display results
-        display_table(report)
+        output.display_table(report)
         
         # Save outputs
+        base = f"audit_{doc.stem}"
         if config.output.save_json:
-            filename = f"audit_{doc.filename.replace('.pdf', '')}.json"
-            save_json(report, filename)
+            output.save_json(report, base + ".json")
         
         if config.output.save_txt:
-            filename = f"audit_{doc.filename.replace('.pdf', '')}.txt"
-            save_table_txt(report, filename)
+            output.save_table_txt(report, base + ".txt")
         
         return report
         
@@ -210,10 +300,26 @@ async def run_pipeline(config_path: str = None, index_only: bool = False, audit_
         console.print("[red]✗ No documents configured in config.yaml[/red]")
         sys.exit(1)
     
-    # Process each document
-    for i, doc in enumerate(config.documents, 1):
+    indexing = not audit_only and not config.pipeline.skip_indexing
+    
+    indexed = set()
+    if indexing:
+        indexed = check_documents_indexed(config, config.documents)
+    
+    total = len(config.documents)
+    
+    def needs_reset(i: int, doc: DocumentConfig) -> bool:
+        return indexing and (doc.reset_collection or (i == 1 and config.pipeline.force_reindex))
+    
+    async def prepare_document(i: int, doc: DocumentConfig, overlapped: bool = False) -> bool:
+        """
+        Indexes a document if needed; returns True if it can be audited.
+        
+        An overlapped document is indexed while an audit is running, so the
+        indexer's progress bar is left out to keep a single live display.
+        """
         console.print(Panel.fit(
-            f"[bold]Document {i}/{len(config.documents)}[/bold]\n"
+            f"[bold]Document {i}/{total}[/bold]\n"
             f"File: {doc.filename}\n"
             f"Type: {doc.doc_type}",
             title="📄 Processing",
@@ -223,35 +329,73 @@ async def run_pipeline(config_path: str = None, index_only: bool = False, audit_
         # Check if file exists
         if not Path(doc.path).exists():
             console.print(f"[red]✗ File not found: {doc.path}[/red]")
-            continue
+            return False
+        
+        if not indexing:
+            return True
+        
+        is_indexed = (doc.filename, doc.doc_type) in indexed
+        if is_indexed and doc.skip_if_indexed and not config.pipeline.force_reindex:
+            console.print(f"[green]✓ {doc.filename} already indexed, skipping...[/green]")
+            return True
+        
+        console.print(f"[cyan]→ Indexing {doc.filename}...[/cyan]")
+        
+        reset = needs_reset(i, doc)
+        success = await asyncio.to_thread(index_document, config, doc, reset, not overlapped)
+        if reset:
+            # Collection was recreated: earlier lookups no longer hold
+            indexed.clear()
+        invalidate_audit_caches(config.milvus.collection_name)
         
-        # ----- INDEXING PHASE -----
-        if not audit_only and not config.pipeline.skip_indexing:
-            is_indexed = check_document_indexed(config, doc)
+        if not success:
+            console.print(f"[red]✗ Failed to index {doc.filename}[/red]")
+            return False
+        
+        indexed.add((doc.filename, doc.doc_type))
+        console.print(f"[green]✓ {doc.filename} indexed successfully[/green]")
+        return True
+    
+    # Documents are indexed one at a time in a worker thread, and audited one
+    # at a time on the event loop: indexing of the next document overlaps the
+    # audit of the current one. A document that resets the collection is not
+    # indexed until the audit before it has finished. The indexer uses its own
+    # Milvus connection, so the audit's reconnects do not affect it.
+    docs = config.documents
+    warmed_up = False
+    next_prep = asyncio.create_task(prepare_document(1, docs[0]))
+    try:
+        for i, doc in enumerate(docs, 1):
+            ready = await next_prep
+            next_prep = None
             
-            if is_indexed and doc.skip_if_indexed and not config.pipeline.force_reindex:
-                console.print(f"[green]✓ Document already indexed, skipping...[/green]")
-            else:
-                console.print(f"[cyan]→ Indexing document...[/cyan]")
-                
-                reset = doc.reset_collection or (i == 1 and config.pipeline.force_reindex)
-                success = index_document(config, doc, reset=reset)
+            if i < total and not needs_reset(i + 1, docs[i]):
+                next_prep = asyncio.create_task(
+                    prepare_document(i + 1, docs[i], overlapped=ready and not index_only)
+                )
+            
+            # ----- AUDIT PHASE -----
+            if ready and not index_only:
+                if not warmed_up:
+                    await asyncio.to_thread(warm_up_audit, config)
+                    warmed_up = True
                 
-                if not success:
-                    console.print(f"[red]✗ Failed to index {doc.filename}[/red]")
-                    continue
+                console.print(f"[cyan]→ Running audit on {doc.filename}...[/cyan]")
+                report = await run_audit_for_document(config, doc)
                 
-                console.print(f"[green]✓ Document indexed successfully[/green]")
-        
-        # ----- AUDIT PHASE -----
-        if not index_only:
-            console.print(f"[cyan]→ Running audit...[/cyan]")
-            report = await run_audit_for_document(config, doc)
+                if report:
+                    console.print(
+                        f"[green]✓ Audit of {doc.filename} completed: "
+                        f"{report.compliance_rate}% compliance[/green]"
+                    )
             
-            if report:
-                console.print(f"[green]✓ Audit completed: {report.compliance_rate}% compliance[/green]")
-        
-        console.print()
+            console.print()
+            
+            if i < total and next_prep is None:
+                next_prep = asyncio.create_task(prepare_document(i + 1, docs[i]))
+    finally:
+        if next_prep is not None:
+            next_prep.cancel()
     
     console.print(Panel.fit(
         "[bold green]Pipeline completed![/bold green]",
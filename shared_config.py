@@ -4,12 +4,22 @@
 # other modules in the system.
 # ============================================================================
 
+import functools
 import os
+import tempfile
+import threading
+import orjson
 import yaml
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Optional
 
+try:
+    # libyaml C parser, bundled with the PyYAML wheels
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 @dataclass
 class MilvusConfig:
@@ -50,10 +60,13 @@ class DocumentConfig:
     doc_type: str
     skip_if_indexed: bool = True
     reset_collection: bool = False
+    # Derived from path once, in __post_init__
+    filename: str = field(init=False)
+    stem: str = field(init=False)
     
-    @property
-    def filename(self) -> str:
-        return Path(self.path).name
+    def __post_init__(self):
+        self.filename = os.path.basename(self.path)
+        self.stem = os.path.splitext(self.filename)[0]
 
 
 @dataclass
@@ -96,160 +109,273 @@ class Config:
     pipeline: PipelineConfig = field(default_factory=PipelineConfig)
 
 
-def load_config(config_path: Optional[str] = None) -> Config:
+# Field names per config dataclass, introspected once at import
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {
+    cls: tuple(f.name for f in fields(cls) if f.init)
+    for cls in (
+        MilvusConfig, ChunkingConfig, EmbeddingConfig, LLMConfig, OutputConfig,
+        DocumentConfig, CriterionConfig, DeepAgentConfig, PossibleAnswersConfig,
+        PipelineConfig,
+    )
+}
+
+# Config sections that map one YAML mapping onto one dataclass
+_SECTIONS: dict[str, type] = {
+    "milvus": MilvusConfig,
+    "chunking": ChunkingConfig,
+    "embedding": EmbeddingConfig,
+    "llm": LLMConfig,
+    "output": OutputConfig,
+    "deep_agent": DeepAgentConfig,
+    "possible_answers": PossibleAnswersConfig,
+    "pipeline": PipelineConfig,
+}
+
+
+def _from_dict(cls, data: dict):
     """
-    Loads configuration from YAML file.
+    Builds a config dataclass from a YAML mapping.
+    
+    Keys the dataclass does not declare are ignored; missing keys fall back
+    to the field defaults.
+    
+    Args:
+        cls: Config dataclass to build
+        data: Parsed YAML mapping for that section
+    
+    Returns:
+        Instance of cls
+    """
+    return cls(**{name: data[name] for name in _FIELD_NAMES[cls] if name in data})
+
+
+# Locations searched for config.yaml, in order
+_SEARCH_PATHS: tuple[str, ...] = tuple(
+    str(p) for p in (
+        Path("config.yaml"),
+        Path("../config.yaml"),
+        Path("../../config.yaml"),
+        Path(__file__).parent / "config.yaml",
+        Path(__file__).parent.parent / "config.yaml",
+        Path(__file__).parent.parent.parent / "config.yaml",
+    )
+)
+
+
+def _resolve_config_path(config_path: Optional[str] = None) -> str:
+    """
+    Finds the config.yaml to load.
     
     Args:
-        config_path: Path to config.yaml. If None, searches in:
+        config_path: Explicit path. If None, searches in:
             1. CONFIG_PATH environment variable
             2. ./config.yaml
             3. ../config.yaml
             4. ../../config.yaml
     
     Returns:
-        Config object with all settings
+        Path of an existing config file
+    
+    Raises:
+        FileNotFoundError: If no config file is found
     """
     if config_path is None:
         config_path = os.environ.get("CONFIG_PATH")
     
     if config_path is None:
-        # Search for config.yaml in common locations
-        search_paths = [
-            Path("config.yaml"),
-            Path("../config.yaml"),
-            Path("../../config.yaml"),
-            Path(__file__).parent / "config.yaml",
-            Path(__file__).parent.parent / "config.yaml",
-            Path(__file__).parent.parent.parent / "config.yaml",
-        ]
-        
-        for path in search_paths:
-            if path.exists():
-                config_path = str(path)
-                break
-    
-    if config_path is None or not Path(config_path).exists():
+        config_path = next(filter(os.path.isfile, _SEARCH_PATHS), None)
+    
+    if config_path is None or not os.path.exists(config_path):
         raise FileNotFoundError(
             "config.yaml not found. Create one or set CONFIG_PATH environment variable."
         )
     
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    return config_path
+
+
+def _load_yaml(stream) -> dict:
+    """Parses YAML with the fastest available safe loader."""
+    return yaml.load(stream, Loader=_YamlLoader) or {}
+
+
+# Bump when the sidecar layout changes so stale caches are ignored
+SIDECAR_SCHEMA_VERSION = 1
+
+
+def _sidecar_path(path: str) -> Path:
+    """Returns the JSON cache written next to a YAML file (config.yaml.cache.json)."""
+    p = Path(path)
+    return p.with_name(p.name + ".cache.json")
+
+
+def _read_sidecar(path: str, key: tuple[int, int, int]) -> Optional[dict]:
+    """
+    Loads the JSON cache of a YAML file if it was written for this exact version.
     
-    # Parse milvus config
-    milvus_data = data.get("milvus", {})
-    milvus = MilvusConfig(
-        uri=milvus_data.get("uri", "http://127.0.0.1:19530"),
-        collection_name=milvus_data.get("collection_name", "audit_docs_v3")
-    )
+    Args:
+        path: Path to the YAML file
+        key: (mtime_ns, size, inode) of the YAML file
     
-    # Parse chunking config
-    chunking_data = data.get("chunking", {})
-    chunking = ChunkingConfig(
-        chunk_size=chunking_data.get("chunk_size", 1000),
-        chunk_overlap=chunking_data.get("chunk_overlap", 100)
-    )
+    Returns:
+        Parsed content, or None if the cache is missing, stale or unreadable
+    """
+    try:
+        with open(_sidecar_path(path), "rb") as f:
+            cached = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
     
-    # Parse embedding config
-    embedding_data = data.get("embedding", {})
-    embedding = EmbeddingConfig(
-        dense_dim=embedding_data.get("dense_dim", 1024),  # BGE-M3 default
-        sparse_model=embedding_data.get("sparse_model", "bge-m3"),
-        dense_model=embedding_data.get("dense_model", "bge-m3"),
-        bm25_model_path=embedding_data.get("bm25_model_path", "./output/bm25_model.json")
-    )
+    if (
+        not isinstance(cached, dict)
+        or cached.get("_schema_v") != SIDECAR_SCHEMA_VERSION
+        or cached.get("source") != list(key)
+    ):
+        return None
+    data = cached.get("data")
+    return data if isinstance(data, dict) else None
+
+
+def _write_sidecar(path: str, key: tuple[int, int, int], data: dict) -> None:
+    """
+    Atomically writes the JSON cache of a parsed YAML file.
     
-    # Parse LLM config
-    llm_data = data.get("llm", {})
-    llm = LLMConfig(
-        model=llm_data.get("model", "gemini-2.0-flash"),
-        temperature=llm_data.get("temperature", 0)
-    )
+    Failures (read-only directory, values JSON cannot represent) are ignored:
+    the cache is only an optimization.
     
-    # Parse output config
-    output_data = data.get("output", {})
-    output = OutputConfig(
-        directory=output_data.get("directory", "./output"),
-        save_json=output_data.get("save_json", True),
-        save_txt=output_data.get("save_txt", True)
-    )
+    Args:
+        path: Path to the YAML file
+        key: (mtime_ns, size, inode) of the YAML file that was parsed
+        data: Parsed YAML content
+    """
+    sidecar = _sidecar_path(path)
+    tmp = None
+    try:
+        payload = orjson.dumps({
+            "_schema_v": SIDECAR_SCHEMA_VERSION,
+            "source": list(key),
+            "data": data,
+        })
+        fd, tmp = tempfile.mkstemp(dir=sidecar.parent, prefix=sidecar.name, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, sidecar)
+    except (OSError, TypeError, ValueError):
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+# Parsed YAML per absolute path, with the (mtime_ns, size, inode) it was read at
+_YAML_CACHE: dict[str, tuple[tuple[int, int, int], dict]] = {}
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _read_yaml_cached(path: str) -> dict:
+    """
+    Parses a YAML file, reusing the previous parse while the file is unchanged.
     
-    # Parse documents
-    documents = []
-    for doc in data.get("documents", []):
-        documents.append(DocumentConfig(
-            path=doc["path"],
-            doc_type=doc["doc_type"],
-            skip_if_indexed=doc.get("skip_if_indexed", True),
-            reset_collection=doc.get("reset_collection", False)
-        ))
-    
-    # Parse audit criteria
-    audit_criteria = []
-    for criterion in data.get("audit_criteria", []):
-        if isinstance(criterion, str):
-            audit_criteria.append(CriterionConfig(query=criterion))
-        else:
-            audit_criteria.append(CriterionConfig(
-                query=criterion["query"],
-                confidence=criterion.get("confidence", 0.7)
-            ))
-    
-    # Parse deep agent config
-    deep_agent_data = data.get("deep_agent", {})
-    deep_agent = DeepAgentConfig(
-        enabled=deep_agent_data.get("enabled", True),
-        max_attempts=deep_agent_data.get("max_attempts", 3),
-        min_confidence=deep_agent_data.get("min_confidence", 0.7)
-    )
+    Across processes, a JSON sidecar written on first parse is loaded instead
+    of the YAML while the YAML's (mtime, size, inode) still match the ones
+    recorded in it.
     
-    # Parse possible answers config
-    possible_answers_data = data.get("possible_answers", {})
-    possible_answers = PossibleAnswersConfig(
-        enabled=possible_answers_data.get("enabled", False)
-    )
+    The returned dict is shared between callers and must not be mutated.
     
-    # Parse pipeline config
-    pipeline_data = data.get("pipeline", {})
-    pipeline = PipelineConfig(
-        force_reindex=pipeline_data.get("force_reindex", False),
-        display_metrics=pipeline_data.get("display_metrics", True),
-        skip_indexing=pipeline_data.get("skip_indexing", False)
-    )
+    Args:
+        path: Path to the YAML file
+    
+    Returns:
+        Parsed YAML content
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    with _YAML_CACHE_LOCK:
+        entry = _YAML_CACHE.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+    
+    data = _read_sidecar(path, key)
+    if data is None:
+        with open(path, "r", encoding="utf-8") as f:
+            # Key the parse by the file actually opened, not the earlier stat
+            st = os.fstat(f.fileno())
+            key = (st.st_mtime_ns, st.st_size, st.st_ino)
+            data = _load_yaml(f)
+        _write_sidecar(path, key, data)
+    
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE[path] = (key, data)
+    return data
+
+
+def load_config(config_path: Optional[str] = None) -> Config:
+    """
+    Loads configuration from YAML file.
+    
+    Args:
+        config_path: Path to config.yaml. If None, it is searched for
+            (see _resolve_config_path)
+    
+    Returns:
+        Config object with all settings
+    """
+    config_path = _resolve_config_path(config_path)
+    
+    data = _read_yaml_cached(config_path)
+    
+    documents = [_from_dict(DocumentConfig, doc) for doc in data.get("documents") or ()]
+    
+    # Criteria may be given as plain query strings
+    audit_criteria = [
+        CriterionConfig(query=criterion) if isinstance(criterion, str)
+        else _from_dict(CriterionConfig, criterion)
+        for criterion in data.get("audit_criteria") or ()
+    ]
     
     return Config(
-        milvus=milvus,
-        chunking=chunking,
-        embedding=embedding,
-        llm=llm,
-        output=output,
         documents=documents,
         audit_criteria=audit_criteria,
-        deep_agent=deep_agent,
-        possible_answers=possible_answers,
-        pipeline=pipeline
+        **{name: _from_dict(cls, data.get(name) or {}) for name, cls in _SECTIONS.items()}
     )
 
 
-# Global config instance (lazy loaded)
-_config: Optional[Config] = None
+@functools.lru_cache(maxsize=8)
+def _load_config_version(path: str, mtime_ns: int) -> Config:
+    """Loads a config file once per (absolute path, mtime) version."""
+    return load_config(path)
+
+
+# Config file most recently requested, reused when no path is given
+_last_path: Optional[str] = None
 
 
 def get_config(config_path: Optional[str] = None) -> Config:
     """
-    Gets the global config instance, loading it if necessary.
+    Gets the shared config instance, loading it if necessary.
+    
+    The parsed config is reused until the file changes on disk (checked by
+    mtime); several config files can be cached side by side.
     
     Args:
-        config_path: Path to config.yaml (only used on first call)
+        config_path: Path to config.yaml (defaults to the file already
+            loaded, or the search order of load_config)
     
     Returns:
         Config object
     """
-    global _config
-    if _config is None:
-        _config = load_config(config_path)
-    return _config
+    global _last_path
+    
+    if config_path is None and _last_path is not None:
+        path = _last_path
+    else:
+        path = os.path.abspath(_resolve_config_path(config_path))
+    
+    config = _load_config_version(path, os.stat(path).st_mtime_ns)
+    _last_path = path
+    return config
 
 
 def reload_config(config_path: Optional[str] = None) -> Config:
@@ -262,6 +388,7 @@ def reload_config(config_path: Optional[str] = None) -> Config:
     Returns:
         New Config object
     """
-    global _config
-    _config = load_config(config_path)
-    return _config
+    _load_config_version.cache_clear()
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE.clear()
+    return get_config(_resolve_config_path(config_path))